@@ -1,7 +1,17 @@
 """Core module exports"""
 
+from .async_client import AsyncTS3Client
 from .monitor import TS3Monitor
 from .notifier import Notifier
+from .pool import TS3ConnectionPool, default_pool
 from .ts3_client import TS3_AVAILABLE, TS3Client
 
-__all__ = ["TS3Client", "TS3Monitor", "Notifier", "TS3_AVAILABLE"]
+__all__ = [
+    "AsyncTS3Client",
+    "TS3Client",
+    "TS3ConnectionPool",
+    "TS3Monitor",
+    "Notifier",
+    "TS3_AVAILABLE",
+    "default_pool",
+]
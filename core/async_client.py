@@ -0,0 +1,361 @@
+"""TeamSpeak 3 ServerQuery 异步客户端
+
+基于 asyncio 流直接实现 ServerQuery 文本协议，用于长连接监控：
+连接后注册服务器事件，由服务器主动推送用户进出通知。
+"""
+
+import asyncio
+import contextlib
+import re
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+from astrbot.api import logger
+
+from ..utils.net import tune_query_socket
+from .ts3_client import (
+    ChannelInfo,
+    ClientInfo,
+    ServerStatus,
+    build_server_status,
+    parse_channel_list,
+    parse_client_list,
+)
+
+# ServerQuery 转义表（反斜杠必须最先处理）
+_ESCAPE_TABLE = (
+    ("\\", "\\\\"),
+    ("/", "\\/"),
+    (" ", "\\s"),
+    ("|", "\\p"),
+    ("\a", "\\a"),
+    ("\b", "\\b"),
+    ("\f", "\\f"),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\t", "\\t"),
+    ("\v", "\\v"),
+)
+_UNESCAPE_MAP = {escaped[1]: raw for raw, escaped in _ESCAPE_TABLE}
+_UNESCAPE_RE = re.compile(r"\\(.)")
+
+# 单行最大长度，大型服务器的 clientlist/channellist 可能超过 asyncio 默认的 64 KiB
+_STREAM_LIMIT = 1 << 20
+
+
+def escape(value: str) -> str:
+    """按 ServerQuery 规则转义参数值"""
+    for raw, escaped in _ESCAPE_TABLE:
+        value = value.replace(raw, escaped)
+    return value
+
+
+def unescape(value: str) -> str:
+    """还原 ServerQuery 转义的参数值"""
+    return _UNESCAPE_RE.sub(lambda m: _UNESCAPE_MAP.get(m.group(1), m.group(1)), value)
+
+
+def parse_entries(text: str) -> list[dict[str, str]]:
+    """解析 ServerQuery 响应行
+
+    Args:
+        text: 已解码的响应行，多个条目以 "|" 分隔
+
+    Returns:
+        条目字典列表
+    """
+    entries = []
+    for raw_entry in text.split("|"):
+        entry = {}
+        for prop in raw_entry.split(" "):
+            if not prop:
+                continue
+            key, _, value = prop.partition("=")
+            entry[key] = unescape(value)
+        entries.append(entry)
+    return entries
+
+
+class TS3QueryError(Exception):
+    """ServerQuery 命令返回错误"""
+
+    def __init__(self, error_id: int, message: str):
+        super().__init__(f"ServerQuery 错误 {error_id}: {message}")
+        self.error_id = error_id
+        self.message = message
+
+
+class AsyncTS3Client:
+    """TeamSpeak 3 ServerQuery 异步客户端
+
+    后台任务持续读取连接：命令响应按发送顺序交付给等待者，
+    notify 开头的事件行放入事件队列，由 events() 消费。
+    """
+
+    # 默认超时时间（秒）
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(
+        self,
+        host: str,
+        query_port: int,
+        query_user: str,
+        query_password: str,
+        virtual_server_id: int = 1,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """初始化客户端
+
+        Args:
+            host: 服务器地址
+            query_port: ServerQuery 端口
+            query_user: ServerQuery 用户名
+            query_password: ServerQuery 密码
+            virtual_server_id: 虚拟服务器 ID
+            timeout: 网络操作超时时间（秒），默认 30 秒
+        """
+        self.host = host
+        self.query_port = query_port
+        self.query_user = query_user
+        self.query_password = query_password
+        self.virtual_server_id = virtual_server_id
+        self.timeout = timeout
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        # 等待响应的命令，ServerQuery 按发送顺序依次应答
+        self._pending: deque[asyncio.Future] = deque()
+        self._events: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+    @property
+    def is_connected(self) -> bool:
+        """检查是否已连接"""
+        return self._read_task is not None and not self._read_task.done()
+
+    async def connect(self) -> bool:
+        """连接到服务器并完成登录
+
+        Returns:
+            是否成功连接
+        """
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.query_port, limit=_STREAM_LIMIT),
+                timeout=self.timeout,
+            )
+            sock = self._writer.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    tune_query_socket(sock)
+                except OSError as e:
+                    logger.debug(f"设置套接字选项失败: {e}")
+            # 欢迎信息：第一行为 "TS3"，第二行为说明文字
+            banner = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+            if not banner.strip().startswith(b"TS3"):
+                raise ConnectionError("目标端口不是 TS3 ServerQuery 服务")
+            await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+
+            self._pending.clear()
+            self._events = asyncio.Queue()
+            self._read_task = asyncio.create_task(self._read_loop())
+
+            await self.send(
+                "login",
+                client_login_name=self.query_user,
+                client_login_password=self.query_password,
+            )
+            await self.send("use", sid=self.virtual_server_id)
+            logger.info(f"已连接到 TS3 服务器: {self.host}:{self.query_port}")
+            return True
+        except Exception as e:
+            logger.error(f"连接 TS3 服务器失败: {e}")
+            await self._close()
+            return False
+
+    async def disconnect(self) -> None:
+        """断开连接"""
+        if self._writer is None:
+            return
+        if self.is_connected:
+            with contextlib.suppress(Exception):
+                self._writer.write(b"quit\n")
+        await self._close()
+        logger.info(f"已断开 TS3 服务器: {self.host}")
+
+    async def reconnect(self) -> bool:
+        """重新连接
+
+        Returns:
+            是否成功重连
+        """
+        await self.disconnect()
+        return await self.connect()
+
+    async def send(self, command: str, **params: Any) -> list[dict[str, str]]:
+        """发送命令并等待响应
+
+        Args:
+            command: 命令名称
+            **params: 命令参数
+
+        Returns:
+            解析后的响应条目列表
+
+        Raises:
+            ConnectionError: 未连接或连接已断开
+            TS3QueryError: 服务器返回错误
+            asyncio.TimeoutError: 等待响应超时
+        """
+        parts = [command]
+        parts.extend(f"{key}={escape(str(value))}" for key, value in params.items())
+        (result,) = await self.send_pipelined(" ".join(parts))
+        return result
+
+    async def send_pipelined(self, *commands: str) -> list[list[dict[str, str]]]:
+        """一次写入多条命令，再依次读取响应
+
+        ServerQuery 按顺序处理命令，批量写入可将 N 次往返合并为 1 次。
+
+        Args:
+            *commands: 已转义的完整命令行
+
+        Returns:
+            与命令一一对应的响应条目列表
+
+        Raises:
+            ConnectionError: 未连接或连接已断开
+            TS3QueryError: 任一命令返回错误
+            asyncio.TimeoutError: 等待响应超时
+        """
+        if not self.is_connected or self._writer is None:
+            raise ConnectionError("未连接到 TS3 服务器")
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        # 入队与写入之间没有 await，保证响应顺序与发送顺序一致
+        for _ in commands:
+            future = loop.create_future()
+            self._pending.append(future)
+            futures.append(future)
+        self._writer.write("".join(f"{command}\n" for command in commands).encode("utf-8"))
+        await self._writer.drain()
+        return await asyncio.wait_for(asyncio.gather(*futures), timeout=self.timeout)
+
+    async def register_server_events(self) -> None:
+        """注册服务器事件（用户进入/离开）"""
+        await self.send("servernotifyregister", event="server")
+
+    async def events(self) -> AsyncIterator[tuple[str, dict[str, str]]]:
+        """迭代服务器推送的事件
+
+        Yields:
+            (事件名, 事件数据)，如 ("notifycliententerview", {...})
+
+        Raises:
+            ConnectionError: 连接断开时抛出
+        """
+        while True:
+            line = await self._events.get()
+            if line is None:
+                raise ConnectionError("TS3 连接已断开")
+            name, _, body = line.decode("utf-8", "replace").partition(" ")
+            for entry in parse_entries(body):
+                yield name, entry
+
+    async def get_client_list(self) -> list[ClientInfo]:
+        """获取在线客户端列表
+
+        Returns:
+            客户端信息列表（不包括 ServerQuery 客户端）
+        """
+        return parse_client_list(await self.send("clientlist"))
+
+    async def get_channel_list(self) -> list[ChannelInfo]:
+        """获取频道列表
+
+        Returns:
+            频道信息列表
+        """
+        return parse_channel_list(await self.send("channellist"))
+
+    async def get_server_info(self) -> dict[str, str] | None:
+        """获取服务器信息
+
+        Returns:
+            服务器信息字典
+        """
+        resp = await self.send("serverinfo")
+        return resp[0] if resp else None
+
+    async def get_server_status(self) -> ServerStatus | None:
+        """获取完整的服务器状态
+
+        Returns:
+            服务器状态对象
+        """
+        # 三条查询一次性发出，只付出一次网络往返
+        server_info, clients, channels = await self.send_pipelined(
+            "serverinfo", "clientlist", "channellist"
+        )
+        if not server_info:
+            return None
+        return build_server_status(
+            server_info[0], parse_client_list(clients), parse_channel_list(channels)
+        )
+
+    async def _read_loop(self) -> None:
+        """后台读取任务：分发命令响应与事件"""
+        data: list[dict[str, str]] = []
+        try:
+            while self._reader is not None:
+                line = await self._reader.readline()
+                if not line:
+                    break  # 对端关闭连接
+                line = line.strip(b"\r\n")
+                if not line:
+                    continue
+
+                if line.startswith(b"notify"):
+                    self._events.put_nowait(line)
+                elif line.startswith(b"error "):
+                    error = parse_entries(line[6:].decode("utf-8", "replace"))[0]
+                    result, data = data, []
+                    if not self._pending:
+                        continue
+                    future = self._pending.popleft()
+                    if future.done():
+                        continue  # 等待者已超时
+                    error_id = int(error.get("id", 0))
+                    if error_id == 0:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(TS3QueryError(error_id, error.get("msg", "")))
+                else:
+                    data.extend(parse_entries(line.decode("utf-8", "replace")))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"读取 TS3 连接出错 ({self.host}): {e}")
+        finally:
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("TS3 连接已断开"))
+            self._events.put_nowait(None)
+
+    async def _close(self) -> None:
+        """关闭底层连接并停止读取任务"""
+        writer, self._writer = self._writer, None
+        read_task, self._read_task = self._read_task, None
+        self._reader = None
+
+        if writer is not None:
+            with contextlib.suppress(Exception):
+                writer.close()
+                await asyncio.wait_for(writer.wait_closed(), timeout=5)
+        if read_task is not None and not read_task.done():
+            read_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await read_task
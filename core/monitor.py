@@ -1,20 +1,66 @@
 """TS3 服务器监控器模块"""
 
+import asyncio
+import heapq
+import logging
+import operator
+import random
 import time
 from collections.abc import Callable
-from threading import Event, Lock, Thread
 
 from astrbot.api import logger
 
-from .ts3_client import TS3_AVAILABLE, ClientInfo, ServerStatus, TS3Client
+from ..utils.constants import DEFAULT_KEEPALIVE_INTERVAL
+from .async_client import AsyncTS3Client
+from .ts3_client import ClientInfo, ServerStatus
+
+_CLID = operator.attrgetter("clid")
+
+
+def _clid_mix(clid: int) -> int:
+    """将 clid 散列为 64 位值，用于按位异或累积成员指纹"""
+    return (clid * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+
+def _membership_hash(clids) -> int:
+    """计算 clid 集合的指纹（与顺序无关）"""
+    h = 0
+    for clid in clids:
+        h ^= _clid_mix(clid)
+    return h
+
+
+class _ServerLogAdapter(logging.LoggerAdapter):
+    """为日志添加服务器前缀（前缀只构建一次，级别未启用时不做格式化）"""
+
+    def process(self, msg, kwargs):
+        return f"{self.extra['prefix']}{msg}", kwargs
+
+
+async def _wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """等待事件被设置，超时返回 False
+
+    不使用 asyncio.wait_for：Python 3.11 下若取消与事件触发同时发生，
+    wait_for 会吞掉取消请求，导致 stop() 无法结束任务。
+    """
+    waiter = asyncio.ensure_future(event.wait())
+    try:
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+        return bool(done)
+    finally:
+        waiter.cancel()
 
 
 class TS3Monitor:
     """TeamSpeak 3 服务器监控器
 
-    使用轮询方式监控服务器状态，检测用户加入/离开。
+    通过 ServerQuery 事件通知（servernotifyregister）监控服务器，
+    由服务器主动推送用户加入/离开，无需轮询。
     """
 
+    # 状态缓存有效期（秒）
+    STATUS_CACHE_TTL = 5
+
     def __init__(
         self,
         server_name: str,
@@ -24,7 +70,7 @@ class TS3Monitor:
         query_password: str,
         virtual_server_id: int = 1,
         status_interval: int = 60,
-        poll_interval: int = 10,
+        keepalive_interval: int = DEFAULT_KEEPALIVE_INTERVAL,
         on_client_join: Callable[[str, ClientInfo], None] | None = None,
         on_client_leave: Callable[[str, ClientInfo], None] | None = None,
         on_status_tick: Callable[[str, ServerStatus], None] | None = None,
@@ -39,21 +85,22 @@ class TS3Monitor:
             query_password: ServerQuery 密码
             virtual_server_id: 虚拟服务器 ID
             status_interval: 状态推送间隔（分钟）
-            poll_interval: 轮询间隔（秒）
+            keepalive_interval: 保活间隔（秒），同时用于校对在线列表
             on_client_join: 用户加入回调
             on_client_leave: 用户离开回调
             on_status_tick: 状态推送回调
         """
         self.server_name = server_name
+        self._log = _ServerLogAdapter(logger, {"prefix": f"[{server_name}] "})
         self.status_interval = status_interval
-        self.poll_interval = poll_interval
+        self.keepalive_interval = keepalive_interval
 
         self.on_client_join = on_client_join
         self.on_client_leave = on_client_leave
         self.on_status_tick = on_status_tick
 
         # TS3 客户端
-        self.client = TS3Client(
+        self.client = AsyncTS3Client(
             host=host,
             query_port=query_port,
             query_user=query_user,
@@ -63,204 +110,342 @@ class TS3Monitor:
 
         # 状态
         self.running = False
-        self._stop_event = Event()  # 用于可中断睡眠
-        self._thread: Thread | None = None
-        self._lock = Lock()
+        self._stop_event = asyncio.Event()  # 用于可中断等待
+        self._interval_changed = asyncio.Event()  # 唤醒状态推送任务
+        self._task: asyncio.Task | None = None
+
+        # 状态缓存：(获取时间, 状态)，定时推送与 /ts status 共享
+        self._status_cache: tuple[float, ServerStatus] | None = None
+        self._status_query: asyncio.Future | None = None  # 进行中的状态查询
 
         # 客户端追踪
         self._known_clients: dict[int, ClientInfo] = {}  # clid -> ClientInfo
+        self._known_hash = 0  # 已知客户端的成员指纹，随加入/离开增量更新
         self._last_status_time: float = 0
+        # 校对时复用的快照缓冲区，避免每次校对重新分配
+        self._snapshot: dict[int, ClientInfo] = {}
 
-        # 防抖动
+        # 防抖动（仅用于在线列表校对，事件推送的离开是确定的）
         self._pending_leaves: dict[int, tuple[ClientInfo, float]] = {}  # clid -> (info, leave_time)
+        # 按到期时间排序的待确认离开 (expiry, clid)，取消的条目在弹出时惰性丢弃
+        self._leave_heap: list[tuple[float, int]] = []
         self._leave_debounce_seconds = 2  # 用户离开后等待 2 秒确认
 
-    def _run(self) -> None:
-        """监控主循环"""
+    async def _run(self) -> None:
+        """监控主循环：负责连接与重连"""
         reconnect_attempts = 0
         max_reconnect_attempts = 5
-        initial_retry_delay = 30  # 首次连接失败后的重试间隔
         long_sleep_minutes = 30  # 长睡眠模式等待时间（分钟）
+        first_connect = True
 
         try:
-            # 首次连接，失败则进入重试循环
             while not self._stop_event.is_set():
-                if self.client.connect():
-                    break
-                reconnect_attempts += 1
-                if reconnect_attempts >= max_reconnect_attempts:
-                    # 进入长睡眠模式，而非永久停止
-                    logger.warning(
-                        f"[{self.server_name}] 连接失败次数过多，"
-                        f"进入长睡眠模式（{long_sleep_minutes}分钟后重试）"
+                if not await self._connect(initial=first_connect):
+                    reconnect_attempts += 1
+                    if reconnect_attempts >= max_reconnect_attempts:
+                        # 进入长睡眠模式，而非永久停止
+                        self._log.warning(
+                            "连接失败次数过多，"
+                            f"进入长睡眠模式（{long_sleep_minutes}分钟后重试）"
+                        )
+                        if await self._wait_stop(long_sleep_minutes * 60):
+                            return
+                        reconnect_attempts = 0  # 重置计数，继续尝试
+                        continue
+                    retry_delay = self._backoff(reconnect_attempts)
+                    self._log.warning(
+                        f"连接失败，{retry_delay:.1f}秒后重试 "
+                        f"({reconnect_attempts}/{max_reconnect_attempts})"
                     )
-                    if self._stop_event.wait(timeout=long_sleep_minutes * 60):
+                    if await self._wait_stop(retry_delay):
                         return
-                    reconnect_attempts = 0  # 重置计数，继续尝试
                     continue
-                logger.warning(
-                    f"[{self.server_name}] 连接失败，{initial_retry_delay}秒后重试 "
-                    f"({reconnect_attempts}/{max_reconnect_attempts})"
-                )
-                # 可中断睡眠：如果 _stop_event 被设置，立即返回
-                if self._stop_event.wait(timeout=initial_retry_delay):
+
+                if first_connect:
+                    # 设置首次状态推送时间
+                    self._last_status_time = time.time()
+                    first_connect = False
+                reconnect_attempts = 0
+                self.running = True
+                self._log.info("监控已启动")
+
+                try:
+                    await self._serve()
+                except Exception as e:
+                    self._log.warning(f"连接中断: {e}")
+                finally:
+                    self.running = False
+                    await self.client.disconnect()
+
+                # 短暂随机等待，避免多个监控器在网络恢复时同时重连
+                if await self._wait_stop(self._backoff(0)):
                     return
+                self._log.info("尝试重连")
 
-            if self._stop_event.is_set():
-                return
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self._log.error(f"监控器异常: {e}", exc_info=True)
+        finally:
+            self.running = False
+            await self.client.disconnect()
+            self._log.info("监控已停止")
 
-            with self._lock:
-                self.running = True
+    async def _connect(self, initial: bool) -> bool:
+        """建立连接、注册事件并同步在线列表
 
-            logger.info(f"[{self.server_name}] 监控已启动")
+        Args:
+            initial: 是否为首次连接（首次连接不推送已在线用户）
 
-            # 初始化客户端列表
-            initial_clients = self.client.get_client_list()
-            for c in initial_clients:
-                self._known_clients[c.clid] = c
-            logger.info(f"[{self.server_name}] 初始在线: {len(self._known_clients)} 人")
+        Returns:
+            是否成功
+        """
+        if not await self.client.connect():
+            return False
+        try:
+            await self.client.register_server_events()
+            clients = await self.client.get_client_list()
+        except Exception as e:
+            self._log.error(f"注册事件失败: {e}")
+            await self.client.disconnect()
+            return False
 
-            # 设置首次状态推送时间
-            self._last_status_time = time.time()
+        if initial:
+            self._known_clients = {c.clid: c for c in clients}
+            self._known_hash = _membership_hash(self._known_clients)
+            self._log.info(f"初始在线: {len(self._known_clients)} 人")
+        else:
+            # 重连期间可能错过事件，与快照比对补发
+            self._reconcile(clients, time.time())
+        return True
 
-            # 重置重连计数
-            reconnect_attempts = 0
+    async def _serve(self) -> None:
+        """在已建立的连接上处理事件，直到连接断开"""
+        tasks = [
+            asyncio.create_task(self._consume_events()),
+            asyncio.create_task(self._keepalive()),
+        ]
+        ticker = asyncio.create_task(self._status_ticker())
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # 传播连接异常
+        finally:
+            for task in (*tasks, ticker):
+                task.cancel()
+            await asyncio.gather(*tasks, ticker, return_exceptions=True)
+
+    async def _consume_events(self) -> None:
+        """处理服务器推送的用户进入/离开事件"""
+        async for name, data in self.client.events():
+            if name == "notifycliententerview":
+                client = ClientInfo(
+                    clid=int(data.get("clid", 0)),
+                    client_nickname=data.get("client_nickname", "Unknown"),
+                    client_database_id=int(data.get("client_database_id", 0)),
+                    cid=int(data.get("ctid", 0)),
+                    client_type=int(data.get("client_type", 0)),
+                )
+                # 跳过 ServerQuery 客户端
+                if client.client_type == 1:
+                    continue
+                self._handle_join(client)
+            elif name == "notifyclientleftview":
+                clid = int(data.get("clid", 0))
+                client = self._known_clients.get(clid)
+                if client is not None:
+                    self._handle_leave(clid, client)
+
+    async def _keepalive(self) -> None:
+        """定期发送 clientlist 保持会话，并校对在线列表"""
+        while True:
+            # 有待确认的离开时，提前校对
+            timeout = self._leave_debounce_seconds if self._pending_leaves else self.keepalive_interval
+            await asyncio.sleep(timeout)
+            clients = await self.client.get_client_list()
+            self._reconcile(clients, time.time())
+
+    async def _status_ticker(self) -> None:
+        """定时推送服务器状态"""
+        while True:
+            remaining = self._last_status_time + self.status_interval * 60 - time.time()
+            if remaining > 0:
+                self._interval_changed.clear()
+                if await _wait_event(self._interval_changed, remaining):
+                    continue  # 间隔已更新，重新计算
 
-            while not self._stop_event.is_set():
+            self._last_status_time = time.time()
+            self._log.info("触发状态推送")
+            if self.on_status_tick:
                 try:
-                    # 获取当前客户端列表
-                    current_clients = self.client.get_client_list()
-                    current_clids = {c.clid for c in current_clients}
-                    current_map = {c.clid: c for c in current_clients}
-
-                    now = time.time()
-
-                    # 检测新加入的客户端
-                    for clid, client in current_map.items():
-                        # 如果在待离开列表中，取消离开
-                        if clid in self._pending_leaves:
-                            del self._pending_leaves[clid]
-                            logger.debug(f"[{self.server_name}] 用户 {client.client_nickname} 取消离开（重连）")
-                            continue
-
-                        if clid not in self._known_clients:
-                            self._known_clients[clid] = client
-                            logger.info(f"[{self.server_name}] 用户加入: {client.client_nickname}")
-                            if self.on_client_join:
-                                try:
-                                    self.on_client_join(self.server_name, client)
-                                except Exception as e:
-                                    logger.error(f"加入回调出错: {e}", exc_info=True)
-
-                    # 检测离开的客户端（加入待离开列表）
-                    known_clids = set(self._known_clients.keys())
-                    for clid in known_clids - current_clids:
-                        if clid not in self._pending_leaves:
-                            client = self._known_clients[clid]
-                            self._pending_leaves[clid] = (client, now)
-                            logger.debug(f"[{self.server_name}] 用户 {client.client_nickname} 可能离开，等待确认")
-
-                    # 处理确认离开的客户端
-                    confirmed_leaves = []
-                    for clid, (client, leave_time) in list(self._pending_leaves.items()):
-                        if now - leave_time >= self._leave_debounce_seconds:
-                            confirmed_leaves.append((clid, client))
-
-                    for clid, client in confirmed_leaves:
-                        del self._pending_leaves[clid]
-                        if clid in self._known_clients:
-                            del self._known_clients[clid]
-                        logger.info(f"[{self.server_name}] 用户离开: {client.client_nickname}")
-                        if self.on_client_leave:
-                            try:
-                                self.on_client_leave(self.server_name, client)
-                            except Exception as e:
-                                logger.error(f"离开回调出错: {e}", exc_info=True)
-
-                    # 检查是否需要推送状态
-                    status_interval_seconds = self.status_interval * 60
-                    if now - self._last_status_time >= status_interval_seconds:
-                        self._last_status_time = now
-                        logger.info(f"[{self.server_name}] 触发状态推送")
-                        if self.on_status_tick:
-                            try:
-                                # 复用现有连接获取状态
-                                status = self.client.get_server_status()
-                                if status:
-                                    self.on_status_tick(self.server_name, status)
-                            except Exception as e:
-                                logger.error(f"状态推送回调出错: {e}", exc_info=True)
-
-                    # 重置重连计数
-                    reconnect_attempts = 0
-
+                    # 复用现有连接获取状态
+                    status = await self.get_status()
+                    if status:
+                        self.on_status_tick(self.server_name, status)
                 except Exception as e:
-                    logger.error(f"[{self.server_name}] 监控循环出错: {e}", exc_info=True)
-                    reconnect_attempts += 1
+                    self._log.error(f"状态推送回调出错: {e}", exc_info=True)
 
-                    if reconnect_attempts >= max_reconnect_attempts:
-                        # 进入长睡眠模式，而非永久停止
-                        logger.warning(
-                            f"[{self.server_name}] 重连次数过多，"
-                            f"进入长睡眠模式（{long_sleep_minutes}分钟后重试）"
-                        )
-                        if self._stop_event.wait(timeout=long_sleep_minutes * 60):
-                            break
-                        reconnect_attempts = 0  # 重置计数，继续尝试
-                        # 重新连接
-                        if not self.client.reconnect():
-                            continue
-
-                    # 尝试重连
-                    logger.info(f"[{self.server_name}] 尝试重连 ({reconnect_attempts}/{max_reconnect_attempts})")
-                    if not self.client.reconnect():
-                        # 可中断睡眠：重连失败，等待后重试
-                        if self._stop_event.wait(timeout=30):
-                            break
-                        continue
+    def _reconcile(self, current_clients: list[ClientInfo], now: float) -> None:
+        """将在线列表快照与已知客户端比对，补发遗漏的进出事件
+
+        Args:
+            current_clients: 当前在线客户端
+            now: 当前时间
+        """
+        # 快速路径：成员与已知列表一致且没有待确认的离开，无需比对
+        if not self._pending_leaves and len(current_clients) == len(self._known_clients):
+            if _membership_hash(map(_CLID, current_clients)) == self._known_hash:
+                self._leave_heap.clear()  # 此时堆中只剩已取消的条目
+                return
 
-                # 可中断睡眠：等待下一次轮询
-                if self._stop_event.wait(timeout=self.poll_interval):
-                    break
+        current_map = self._snapshot
+        current_map.clear()
+        current_map.update(zip(map(_CLID, current_clients), current_clients))
+
+        # 待离开的客户端重新出现，取消离开
+        for clid in self._pending_leaves.keys() & current_map.keys():
+            del self._pending_leaves[clid]
+            if self._log.isEnabledFor(logging.DEBUG):
+                self._log.debug(f"用户 {current_map[clid].client_nickname} 取消离开（重连）")
+
+        # 检测新加入的客户端（dict_keys 直接做集合运算，无需复制键集合）
+        for clid in current_map.keys() - self._known_clients.keys():
+            self._handle_join(current_map[clid])
+
+        # 检测离开的客户端（加入待离开列表）
+        for clid in self._known_clients.keys() - current_map.keys():
+            if clid not in self._pending_leaves:
+                client = self._known_clients[clid]
+                self._pending_leaves[clid] = (client, now)
+                heapq.heappush(self._leave_heap, (now + self._leave_debounce_seconds, clid))
+                if self._log.isEnabledFor(logging.DEBUG):
+                    self._log.debug(f"用户 {client.client_nickname} 可能离开，等待确认")
+
+        # 处理确认离开的客户端（只弹出已到期的条目）
+        while self._leave_heap and self._leave_heap[0][0] <= now:
+            _, clid = heapq.heappop(self._leave_heap)
+            entry = self._pending_leaves.get(clid)
+            # 已取消，或同一 clid 之后重新进入待离开（以新条目为准）
+            if entry is None or now - entry[1] < self._leave_debounce_seconds:
+                continue
+            self._handle_leave(clid, entry[0])
+
+        # 不保留对客户端对象的引用
+        current_map.clear()
+
+    def _handle_join(self, client: ClientInfo) -> None:
+        """记录用户加入并触发回调"""
+        if client.clid in self._known_clients:
+            return
+        self._known_clients[client.clid] = client
+        self._known_hash ^= _clid_mix(client.clid)
+        self._log.info(f"用户加入: {client.client_nickname}")
+        if self.on_client_join:
+            try:
+                self.on_client_join(self.server_name, client)
+            except Exception as e:
+                self._log.error(f"加入回调出错: {e}", exc_info=True)
+
+    def _handle_leave(self, clid: int, client: ClientInfo) -> None:
+        """记录用户离开并触发回调"""
+        self._pending_leaves.pop(clid, None)
+        if self._known_clients.pop(clid, None) is None:
+            return
+        self._known_hash ^= _clid_mix(clid)
+        self._log.info(f"用户离开: {client.client_nickname}")
+        if self.on_client_leave:
+            try:
+                self.on_client_leave(self.server_name, client)
+            except Exception as e:
+                self._log.error(f"离开回调出错: {e}", exc_info=True)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """计算重试等待时间（带上限的指数退避 + 随机抖动）
 
-        except Exception as e:
-            logger.error(f"[{self.server_name}] 监控器异常: {e}", exc_info=True)
-        finally:
-            with self._lock:
-                self.running = False
-            self.client.disconnect()
-            logger.info(f"[{self.server_name}] 监控已停止")
+        Args:
+            attempt: 已失败次数
+
+        Returns:
+            等待时间（秒）
+        """
+        return min(300.0, 2.0 * (2**attempt)) + random.uniform(0, 1.5)
+
+    async def _wait_stop(self, timeout: float) -> bool:
+        """可中断等待
+
+        Args:
+            timeout: 等待时间（秒）
+
+        Returns:
+            是否收到停止信号
+        """
+        return await _wait_event(self._stop_event, timeout)
 
     def start(self) -> bool:
-        """启动监控
+        """启动监控（需在事件循环中调用）
 
         Returns:
             是否成功启动
         """
-        if not TS3_AVAILABLE:
-            logger.error("ts3 库未安装，无法启动监控")
-            return False
-
-        if self.running:
+        if self._task is not None and not self._task.done():
             return True
 
         self._stop_event.clear()  # 重置停止事件
-        self._thread = Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._task = asyncio.get_running_loop().create_task(self._run())
         return True
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """停止监控"""
-        self._stop_event.set()  # 设置停止事件，唤醒所有 wait()
-        with self._lock:
-            self.running = False
+        self._stop_event.set()  # 设置停止事件，唤醒所有等待
+        self.running = False
 
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5.0)  # 现在线程应该很快响应
+        if self._task is not None:
+            # 取消请求可能在 await 边界被吞掉，重复取消直至任务结束
+            while not self._task.done():
+                self._task.cancel()
+                await asyncio.wait({self._task}, timeout=1)
+        self._task = None
 
         self._known_clients.clear()
+        self._known_hash = 0
         self._pending_leaves.clear()
-        logger.info(f"[{self.server_name}] 监控器已停止")
+        self._leave_heap.clear()
+        self._status_cache = None
+        self._log.info("监控器已停止")
+
+    async def get_status(self) -> ServerStatus | None:
+        """通过监控连接获取服务器状态
+
+        短时间内的重复请求直接返回缓存，并发请求共享同一次查询。
+
+        Returns:
+            服务器状态，监控未连接时返回 None
+
+        Raises:
+            ConnectionError: 查询过程中连接断开
+            TS3QueryError: 服务器返回错误
+        """
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+            return cached[1]
+        if not self.running or not self.client.is_connected:
+            return None
+
+        if self._status_query is None:
+            self._status_query = asyncio.ensure_future(self._query_status())
+        # shield：单个调用方被取消不影响其他等待同一查询的调用方
+        return await asyncio.shield(self._status_query)
+
+    async def _query_status(self) -> ServerStatus | None:
+        """执行一次状态查询并更新缓存"""
+        try:
+            status = await self.client.get_server_status()
+            if status:
+                self._status_cache = (time.monotonic(), status)
+            return status
+        finally:
+            self._status_query = None
 
     def update_status_interval(self, minutes: int) -> None:
         """更新状态推送间隔
@@ -269,4 +454,5 @@ class TS3Monitor:
             minutes: 新的间隔（分钟）
         """
         self.status_interval = minutes
-        logger.info(f"[{self.server_name}] 状态推送间隔已更新为 {minutes} 分钟")
+        self._interval_changed.set()
+        self._log.info(f"状态推送间隔已更新为 {minutes} 分钟")
@@ -1,19 +1,36 @@
 """通知发送模块"""
 
 import asyncio
+import functools
+import hashlib
 import time
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 from astrbot.api import logger
 from astrbot.api.event import MessageEventResult
 from astrbot.api.message_components import AtAll, Plain
 
-from ..utils.constants import format_duration
 from .ts3_client import ClientInfo, ServerStatus
 
 if TYPE_CHECKING:
     from astrbot.api import star
 
+# 消息分隔线
+DIVIDER = "━━━━━━━━━━━━━━"
+
+# 加入/离开通知的固定部分，构建时只拼接变化的字段
+_JOIN_HEAD = f"📢 TeamSpeak 用户加入\n{DIVIDER}\n🖥️ 服务器: "
+_JOIN_TAIL = f"\n{DIVIDER}\n欢迎加入语音！"
+_LEAVE_HEAD = f"📤 TeamSpeak 用户离开\n{DIVIDER}\n🖥️ 服务器: "
+_LEAVE_TAIL = f"\n{DIVIDER}\n下次再见！"
+
+
+@functools.lru_cache(maxsize=256)
+def _fmt_time(fmt: str, epoch_sec: int) -> str:
+    """格式化时间戳（按秒缓存，同一秒内的多条通知复用结果）"""
+    return time.strftime(fmt, time.localtime(epoch_sec))
+
 
 class Notifier:
     """通知发送器
@@ -21,13 +38,26 @@ class Notifier:
     负责构建和发送 TS3 服务器通知消息。
     """
 
-    def __init__(self, context: "star.Context"):
+    # 同时进行的发送数量上限，避免突发通知压垮平台适配器
+    MAX_CONCURRENT_SENDS = 16
+    # 相同内容发往同一订阅者的去重窗口（秒）
+    DEDUP_WINDOW = 5.0
+    # 去重表超过该大小时清理过期条目
+    DEDUP_PRUNE_SIZE = 512
+
+    def __init__(self, context: "star.Context", max_concurrent_sends: int = MAX_CONCURRENT_SENDS):
         """初始化通知器
 
         Args:
             context: AstrBot 上下文
+            max_concurrent_sends: 同时进行的发送数量上限，所有订阅者与通知批次共享
         """
         self.context = context
+        self._send_semaphore = asyncio.Semaphore(max_concurrent_sends)
+        # (umo, 消息摘要) -> 最近发送时间
+        self._recent_sends: dict[tuple[str, bytes], float] = {}
+        # 服务器别名 -> 状态消息格式化函数
+        self._formatters: dict[str, Callable[[ServerStatus, float], str]] = {}
 
     def build_join_notification(
         self,
@@ -48,17 +78,15 @@ class Notifier:
         if timestamp is None:
             timestamp = time.time()
 
-        time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-
-        return (
-            f"📢 TeamSpeak 用户加入\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"🖥️ 服务器: {server_name}\n"
-            f"👤 用户: {client.client_nickname}\n"
-            f"⏰ 时间: {time_str}\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"欢迎加入语音！"
-        )
+        return "".join((
+            _JOIN_HEAD,
+            server_name,
+            "\n👤 用户: ",
+            client.client_nickname,
+            "\n⏰ 时间: ",
+            _fmt_time("%H:%M:%S", int(timestamp)),
+            _JOIN_TAIL,
+        ))
 
     def build_leave_notification(
         self,
@@ -79,17 +107,15 @@ class Notifier:
         if timestamp is None:
             timestamp = time.time()
 
-        time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-
-        return (
-            f"📤 TeamSpeak 用户离开\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"🖥️ 服务器: {server_name}\n"
-            f"👤 用户: {client.client_nickname}\n"
-            f"⏰ 时间: {time_str}\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"下次再见！"
-        )
+        return "".join((
+            _LEAVE_HEAD,
+            server_name,
+            "\n👤 用户: ",
+            client.client_nickname,
+            "\n⏰ 时间: ",
+            _fmt_time("%H:%M:%S", int(timestamp)),
+            _LEAVE_TAIL,
+        ))
 
     def build_status_notification(
         self,
@@ -110,34 +136,63 @@ class Notifier:
         if timestamp is None:
             timestamp = time.time()
 
-        time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+        formatter = self._formatters.get(server_name)
+        if formatter is None:
+            formatter = self._formatters[server_name] = self._make_status_formatter(server_name)
+        return formatter(status, timestamp)
+
+    def forget_server(self, server_name: str) -> None:
+        """丢弃服务器的缓存状态（删除服务器时调用）
+
+        Args:
+            server_name: 服务器别名
+        """
+        self._formatters.pop(server_name, None)
+
+    def _make_status_formatter(self, server_name: str) -> Callable[[ServerStatus, float], str]:
+        """生成绑定服务器别名的状态消息格式化函数
 
-        # 格式化运行时间（复用 utils 中的函数）
-        uptime_str = format_duration(status.uptime)
+        模板中与单次状态无关的部分预先拼接好，格式化时只填充变化的字段。
 
-        # 构建在线用户列表
-        if status.clients:
-            client_names = [c.client_nickname for c in status.clients]
-            if len(client_names) <= 10:
-                clients_str = "、".join(client_names)
+        Args:
+            server_name: 服务器别名
+
+        Returns:
+            formatter(status, timestamp) -> 格式化的状态消息
+        """
+        head = f"📊 TeamSpeak 服务器状态\n{DIVIDER}\n🖥️ 服务器: {server_name}\n📛 名称: "
+        divider = f"\n{DIVIDER}\n"
+
+        def format_status(status: ServerStatus, timestamp: float) -> str:
+            # 构建在线用户列表
+            names = [c.client_nickname for c in status.clients]
+            if not names:
+                clients_str = "无人在线"
+            elif len(names) <= 10:
+                clients_str = "、".join(names)
             else:
-                clients_str = "、".join(client_names[:10]) + f" 等共 {len(client_names)} 人"
-        else:
-            clients_str = "无人在线"
-
-        return (
-            f"📊 TeamSpeak 服务器状态\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"🖥️ 服务器: {server_name}\n"
-            f"📛 名称: {status.name}\n"
-            f"👥 在线人数: {status.clients_online}/{status.max_clients}\n"
-            f"📁 频道数: {status.channels_online}\n"
-            f"⏱️ 运行时间: {uptime_str}\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"👤 在线用户: {clients_str}\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"🕐 更新时间: {time_str}"
-        )
+                clients_str = "、".join(names[:10]) + f" 等共 {len(names)} 人"
+
+            return "".join((
+                head,
+                status.name,
+                "\n👥 在线人数: ",
+                str(status.clients_online),
+                "/",
+                str(status.max_clients),
+                "\n📁 频道数: ",
+                str(status.channels_online),
+                "\n⏱️ 运行时间: ",
+                status.uptime_str,
+                divider,
+                "👤 在线用户: ",
+                clients_str,
+                divider,
+                "🕐 更新时间: ",
+                _fmt_time("%Y-%m-%d %H:%M:%S", int(timestamp)),
+            ))
+
+        return format_status
 
     async def send_to_subscribers(
         self,
@@ -145,33 +200,157 @@ class Notifier:
         message: str,
         max_retries: int = 3,
         retry_delay: float = 2.0,
-    ) -> None:
+    ) -> dict[str, bool]:
         """发送通知给所有订阅者
 
+        各订阅者并发发送，单个平台缓慢或失败不会阻塞其他订阅者。
+        短时间内发往同一订阅者的相同消息只发送一次。
+
         Args:
             subscriber_settings: {umo -> at_all} 每个订阅者的 @全体设置
             message: 通知消息内容
             max_retries: 最大重试次数
             retry_delay: 重试间隔（秒）
+
+        Returns:
+            重试耗尽后仍发送失败的订阅者 {umo -> at_all}，全部成功时为空
+        """
+        digest = hashlib.blake2b(message.encode("utf-8"), digest_size=8).digest()
+        subscriber_settings = self._drop_recent_duplicates(subscriber_settings, digest)
+        if not subscriber_settings:
+            return {}
+
+        # 每种消息变体只构建一次，所有订阅者共享（发送过程不会修改消息链）
+        plain_result = MessageEventResult()
+        plain_result.chain.append(Plain(message))
+        at_all_result = plain_result
+        if any(subscriber_settings.values()):
+            at_all_result = MessageEventResult()
+            at_all_result.chain.extend([AtAll(), Plain("\n"), Plain(message)])
+
+        umos = list(subscriber_settings)
+        results = await asyncio.gather(
+            *(
+                self._send_one(
+                    umo,
+                    at_all_result if at_all else plain_result,
+                    plain_result,
+                    max_retries,
+                    retry_delay,
+                )
+                for umo, at_all in subscriber_settings.items()
+            ),
+            return_exceptions=True,
+        )
+        # 失败原因已在 _send_one 中记录
+        failed = {
+            umo: subscriber_settings[umo]
+            for umo, result in zip(umos, results)
+            if isinstance(result, BaseException)
+        }
+        # 发送失败的不计入去重表，以免重试被当作重复消息丢弃
+        for umo in failed:
+            self._recent_sends.pop((umo, digest), None)
+        return failed
+
+    async def send_batch(
+        self,
+        items: list[tuple[dict[str, bool], str]],
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+    ) -> list[dict[str, bool]]:
+        """并发发送一批通知
+
+        Args:
+            items: [(subscriber_settings, message)] 待发送的通知
+            max_retries: 每个订阅者的最大重试次数
+            retry_delay: 重试间隔（秒）
+
+        Returns:
+            与 items 一一对应的发送失败的订阅者 {umo -> at_all}，全部成功时为空
+        """
+        results = await asyncio.gather(
+            *(
+                self.send_to_subscribers(settings, message, max_retries, retry_delay)
+                for settings, message in items
+            ),
+            return_exceptions=True,
+        )
+        failed = []
+        for (settings, _), result in zip(items, results):
+            if isinstance(result, BaseException):
+                # 意外错误，视为该通知的所有订阅者均发送失败
+                logger.error(f"发送通知出错: {result}")
+                failed.append(dict(settings))
+            else:
+                failed.append(result)
+        return failed
+
+    def _drop_recent_duplicates(
+        self, subscriber_settings: dict[str, bool], digest: bytes
+    ) -> dict[str, bool]:
+        """过滤掉去重窗口内已发送过相同消息的订阅者，并记录本次发送
+
+        发送前即记录，使并发的相同通知也只发送一次；发送失败时由调用方移除记录。
+
+        Args:
+            subscriber_settings: {umo -> at_all}
+            digest: 通知消息内容的摘要
+
+        Returns:
+            需要实际发送的订阅者设置
         """
+        now = time.monotonic()
+        cutoff = now - self.DEDUP_WINDOW
+        recent = self._recent_sends
+        if len(recent) > self.DEDUP_PRUNE_SIZE:
+            recent = self._recent_sends = {k: t for k, t in recent.items() if t > cutoff}
+
+        pending = {}
         for umo, at_all in subscriber_settings.items():
-            for attempt in range(max_retries):
-                try:
-                    result = MessageEventResult()
-                    # 第一次尝试时使用 @全体，重试时不用
-                    if at_all and attempt == 0:
-                        result.chain.append(AtAll())
-                        result.chain.append(Plain("\n"))
-                    result.chain.append(Plain(message))
-                    await self.context.send_message(umo, result)
-                    logger.info(f"已发送通知到: {umo} (at_all={at_all})")
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"发送通知失败 ({umo})，{retry_delay}秒后重试 "
-                            f"({attempt + 1}/{max_retries}): {e}"
-                        )
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(f"发送通知失败 ({umo})，已达最大重试次数: {e}")
+            key = (umo, digest)
+            if recent.get(key, 0.0) > cutoff:
+                logger.debug(f"跳过重复通知: {umo}")
+                continue
+            recent[key] = now
+            pending[umo] = at_all
+        return pending
+
+    async def _send_one(
+        self,
+        umo: str,
+        result: MessageEventResult,
+        retry_result: MessageEventResult,
+        max_retries: int,
+        retry_delay: float,
+    ) -> None:
+        """发送通知给单个订阅者（带重试）
+
+        Args:
+            umo: unified_msg_origin
+            result: 首次发送的消息
+            retry_result: 重试时发送的消息（不含 @全体）
+            max_retries: 最大重试次数
+            retry_delay: 重试间隔（秒）
+
+        Raises:
+            Exception: 所有尝试均失败时抛出最后一次的异常
+        """
+        at_all = result is not retry_result
+        for attempt in range(max_retries):
+            try:
+                # 第一次尝试时使用 @全体，重试时不用
+                async with self._send_semaphore:
+                    await self.context.send_message(umo, result if attempt == 0 else retry_result)
+                logger.info(f"已发送通知到: {umo} (at_all={at_all})")
+                return
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    logger.warning(
+                        f"发送通知失败 ({umo})，{retry_delay}秒后重试 "
+                        f"({attempt + 1}/{max_retries}): {e}"
+                    )
+                    await asyncio.sleep(retry_delay)
+                else:
+                    logger.error(f"发送通知失败 ({umo})，已达最大重试次数: {e}")
+                    raise
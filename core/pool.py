@@ -0,0 +1,120 @@
+"""TS3 ServerQuery 连接池模块"""
+
+import contextlib
+import time
+from threading import Lock
+from typing import Any
+
+from astrbot.api import logger
+
+# 连接池键：(host, query_port, query_user, query_password)
+PoolKey = tuple[str, int, str, str]
+
+
+class TS3ConnectionPool:
+    """TS3 ServerQuery 连接池
+
+    缓存已登录的同步连接，供一次性查询（/ts add、/ts status）复用，
+    省去重复的 TCP 握手与登录。同一账号可通过 use 切换虚拟服务器，
+    因此键中不包含虚拟服务器 ID。
+
+    该类是线程安全的，连接的借出与归还可发生在不同的工作线程中。
+    """
+
+    def __init__(self, max_idle_per_key: int = 2, idle_timeout: float = 60.0):
+        """初始化连接池
+
+        Args:
+            max_idle_per_key: 每个键最多保留的空闲连接数
+            idle_timeout: 空闲连接的最长保留时间（秒），需小于 ServerQuery 空闲超时
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self._lock = Lock()
+        self._idle: dict[PoolKey, list[tuple[Any, float]]] = {}  # key -> [(connection, released_at)]
+
+    def acquire(self, key: PoolKey, timeout: float) -> Any | None:
+        """借出一个可用的空闲连接
+
+        Args:
+            key: 连接池键
+            timeout: 健康检查超时时间（秒）
+
+        Returns:
+            通过健康检查的连接，没有可用连接时返回 None
+        """
+        while True:
+            expired = []
+            connection = None
+            now = time.monotonic()
+            with self._lock:
+                idle = self._idle.get(key)
+                while idle:
+                    candidate, released_at = idle.pop()
+                    if now - released_at > self.idle_timeout:
+                        expired.append(candidate)
+                        continue
+                    connection = candidate
+                    break
+            for conn in expired:
+                self.discard(conn)
+
+            if connection is None:
+                return None
+            # 借出前做健康检查，失效连接直接丢弃
+            try:
+                connection.send("version", timeout=timeout)
+                return connection
+            except Exception:
+                self.discard(connection)
+
+    def release(self, key: PoolKey, connection: Any) -> None:
+        """归还连接
+
+        Args:
+            key: 连接池键
+            connection: 要归还的连接
+        """
+        self.prune()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append((connection, time.monotonic()))
+                return
+        self.discard(connection)
+
+    def discard(self, connection: Any) -> None:
+        """关闭并丢弃连接"""
+        with contextlib.suppress(Exception):
+            connection.quit()
+
+    def prune(self) -> None:
+        """关闭所有超过空闲时间的连接"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, idle in list(self._idle.items()):
+                alive = [(c, t) for c, t in idle if now - t <= self.idle_timeout]
+                expired.extend(c for c, t in idle if now - t > self.idle_timeout)
+                if alive:
+                    self._idle[key] = alive
+                else:
+                    del self._idle[key]
+        for conn in expired:
+            self.discard(conn)
+
+    def close_all(self) -> None:
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        count = 0
+        for connections in idle.values():
+            for conn, _ in connections:
+                self.discard(conn)
+                count += 1
+        if count:
+            logger.info(f"已关闭 {count} 个空闲 TS3 连接")
+
+
+# 插件内共享的连接池
+default_pool = TS3ConnectionPool()
@@ -1,10 +1,16 @@
 """TeamSpeak 3 ServerQuery 客户端封装"""
 
-from dataclasses import dataclass
+import contextlib
+import operator
+from dataclasses import dataclass, field
 from typing import Any
 
 from astrbot.api import logger
 
+from ..utils.constants import format_duration
+from ..utils.net import tune_query_socket
+from .pool import PoolKey, TS3ConnectionPool, default_pool
+
 try:
     import ts3
 
@@ -15,7 +21,7 @@ except ImportError:
     logger.warning("ts3 库未安装，请运行: pip install ts3")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClientInfo:
     """TS3 客户端信息"""
 
@@ -26,7 +32,7 @@ class ClientInfo:
     client_type: int  # 客户端类型 (0=普通, 1=ServerQuery)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChannelInfo:
     """TS3 频道信息"""
 
@@ -35,7 +41,7 @@ class ChannelInfo:
     total_clients: int  # 频道内客户端数量
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ServerStatus:
     """服务器状态信息"""
 
@@ -46,14 +52,115 @@ class ServerStatus:
     max_clients: int  # 最大客户端数
     channels_online: int  # 频道数
     uptime: int  # 运行时间（秒）
-    clients: list[ClientInfo]  # 在线客户端列表
-    channels: list[ChannelInfo]  # 频道列表
+    clients: tuple[ClientInfo, ...]  # 在线客户端列表
+    channels: tuple[ChannelInfo, ...]  # 频道列表
+    uptime_str: str = field(init=False)  # 格式化的运行时间，创建时计算一次
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "uptime_str", format_duration(self.uptime))
+
+
+# clientlist / channellist / serverinfo 中用到的字段（itemgetter 在 C 层批量取值）
+_CLIENT_FIELDS = operator.itemgetter(
+    "clid", "client_nickname", "client_database_id", "cid", "client_type"
+)
+_CHANNEL_FIELDS = operator.itemgetter("cid", "channel_name", "total_clients")
+_SERVER_FIELDS = operator.itemgetter(
+    "virtualserver_name",
+    "virtualserver_platform",
+    "virtualserver_version",
+    "virtualserver_maxclients",
+    "virtualserver_channelsonline",
+    "virtualserver_uptime",
+)
+
+
+def parse_client_list(rows: list[dict[str, Any]]) -> list[ClientInfo]:
+    """将 clientlist 响应转换为客户端列表
+
+    Args:
+        rows: clientlist 响应条目
+
+    Returns:
+        客户端信息列表（不包括 ServerQuery 客户端）
+
+    Raises:
+        KeyError: 响应缺少必需字段
+    """
+    return [
+        ClientInfo(int(clid), nickname, int(database_id), int(cid), client_type)
+        for clid, nickname, database_id, cid, raw_type in map(_CLIENT_FIELDS, rows)
+        if (client_type := int(raw_type)) != 1  # 跳过 ServerQuery 客户端
+    ]
+
+
+def parse_channel_list(rows: list[dict[str, Any]]) -> list[ChannelInfo]:
+    """将 channellist 响应转换为频道列表
+
+    Args:
+        rows: channellist 响应条目
+
+    Returns:
+        频道信息列表
+
+    Raises:
+        KeyError: 响应缺少必需字段
+    """
+    return [
+        ChannelInfo(int(cid), name, int(total_clients))
+        for cid, name, total_clients in map(_CHANNEL_FIELDS, rows)
+    ]
+
+
+def build_server_status(
+    server_info: dict[str, Any],
+    clients: list[ClientInfo],
+    channels: list[ChannelInfo],
+) -> ServerStatus:
+    """由 serverinfo 响应与客户端/频道列表组装服务器状态
+
+    Args:
+        server_info: serverinfo 响应
+        clients: 过滤后的客户端列表
+        channels: 频道列表
+
+    Returns:
+        服务器状态对象
+    """
+    # 使用过滤后的客户端列表长度，而非服务器报告的数值
+    # 因为服务器报告的数值包含 ServerQuery 连接，可能有多个
+    try:
+        name, platform, version, max_clients, channels_online, uptime = _SERVER_FIELDS(
+            server_info
+        )
+    except KeyError as e:
+        # 正常的 serverinfo 响应总是包含这些字段，缺失时才逐个回退到默认值
+        logger.warning(f"serverinfo 响应缺少字段 {e}，使用默认值")
+        name = server_info.get("virtualserver_name", "Unknown")
+        platform = server_info.get("virtualserver_platform", "Unknown")
+        version = server_info.get("virtualserver_version", "Unknown")
+        max_clients = server_info.get("virtualserver_maxclients", 0)
+        channels_online = server_info.get("virtualserver_channelsonline", 0)
+        uptime = server_info.get("virtualserver_uptime", 0)
+
+    return ServerStatus(
+        name=name,
+        platform=platform,
+        version=version,
+        clients_online=len(clients),  # 使用实际过滤后的客户端数量
+        max_clients=int(max_clients),
+        channels_online=int(channels_online),
+        uptime=int(uptime),
+        clients=tuple(clients),
+        channels=tuple(channels),
+    )
 
 
 class TS3Client:
     """TeamSpeak 3 ServerQuery 客户端
 
     封装 ts3 库，提供连接管理和常用查询方法。
+    连接从连接池借出，断开时归还，供后续一次性查询复用。
     """
 
     # 默认超时时间（秒）
@@ -67,6 +174,7 @@ class TS3Client:
         query_password: str,
         virtual_server_id: int = 1,
         timeout: float = DEFAULT_TIMEOUT,
+        pool: TS3ConnectionPool | None = default_pool,
     ):
         """初始化客户端
 
@@ -77,6 +185,7 @@ class TS3Client:
             query_password: ServerQuery 密码
             virtual_server_id: 虚拟服务器 ID
             timeout: 网络操作超时时间（秒），默认 30 秒
+            pool: 连接池，为 None 时不复用连接
         """
         self.host = host
         self.query_port = query_port
@@ -84,13 +193,19 @@ class TS3Client:
         self.query_password = query_password
         self.virtual_server_id = virtual_server_id
         self.timeout = timeout
+        self.pool = pool
         self._connection: Any = None
+        self._reusable = False  # 查询出错的连接不归还连接池
 
     @property
     def is_connected(self) -> bool:
         """检查是否已连接"""
         return self._connection is not None
 
+    @property
+    def _pool_key(self) -> PoolKey:
+        return (self.host, self.query_port, self.query_user, self.query_password)
+
     def connect(self) -> bool:
         """连接到服务器
 
@@ -101,15 +216,29 @@ class TS3Client:
             logger.error("ts3 库未安装")
             return False
 
+        # 优先复用连接池中已登录的连接
+        if self.pool is not None:
+            pooled = self.pool.acquire(self._pool_key, timeout=self.timeout)
+            if pooled is not None:
+                try:
+                    pooled.use(sid=self.virtual_server_id)
+                    self._connection = pooled
+                    self._reusable = True
+                    return True
+                except Exception:
+                    self.pool.discard(pooled)
+
         try:
             # 使用 timeout 参数避免连接时无限阻塞
             self._connection = ts3.query.TS3Connection()
             self._connection.open(self.host, self.query_port, timeout=self.timeout)
+            self._tune_socket()
             self._connection.login(
                 client_login_name=self.query_user,
                 client_login_password=self.query_password,
             )
             self._connection.use(sid=self.virtual_server_id)
+            self._reusable = True
             logger.info(f"已连接到 TS3 服务器: {self.host}:{self.query_port}")
             return True
         except Exception as e:
@@ -117,15 +246,27 @@ class TS3Client:
             self._connection = None
             return False
 
+    def _tune_socket(self) -> None:
+        """调整底层套接字选项（TCP_NODELAY、keepalive 等）"""
+        try:
+            sock = self._connection._telnet_conn.get_socket()
+        except AttributeError:
+            # ts3 库内部结构变化时跳过，不影响连接本身
+            return
+        try:
+            tune_query_socket(sock)
+        except OSError as e:
+            logger.debug(f"设置套接字选项失败: {e}")
+
     def disconnect(self) -> None:
-        """断开连接"""
+        """断开连接（连接正常时归还连接池）"""
         if self._connection:
-            try:
-                self._connection.quit()
-            except Exception:
-                pass
-            finally:
-                self._connection = None
+            connection, self._connection = self._connection, None
+            if self.pool is not None and self._reusable:
+                self.pool.release(self._pool_key, connection)
+                return
+            with contextlib.suppress(Exception):
+                connection.quit()
             logger.info(f"已断开 TS3 服务器: {self.host}")
 
     def reconnect(self) -> bool:
@@ -149,23 +290,9 @@ class TS3Client:
         try:
             # 使用 send 方法并传入 timeout 参数
             resp = self._connection.send("clientlist", timeout=self.timeout)
-            clients = []
-            for client_data in resp.parsed:
-                client_type = int(client_data.get("client_type", 0))
-                # 跳过 ServerQuery 客户端
-                if client_type == 1:
-                    continue
-                clients.append(
-                    ClientInfo(
-                        clid=int(client_data.get("clid", 0)),
-                        client_nickname=client_data.get("client_nickname", "Unknown"),
-                        client_database_id=int(client_data.get("client_database_id", 0)),
-                        cid=int(client_data.get("cid", 0)),
-                        client_type=client_type,
-                    )
-                )
-            return clients
+            return parse_client_list(resp.parsed)
         except Exception as e:
+            self._reusable = False
             logger.error(f"获取客户端列表失败: {e}")
             return []
 
@@ -181,17 +308,9 @@ class TS3Client:
         try:
             # 使用 send 方法并传入 timeout 参数
             resp = self._connection.send("channellist", timeout=self.timeout)
-            channels = []
-            for channel_data in resp.parsed:
-                channels.append(
-                    ChannelInfo(
-                        cid=int(channel_data.get("cid", 0)),
-                        channel_name=channel_data.get("channel_name", "Unknown"),
-                        total_clients=int(channel_data.get("total_clients", 0)),
-                    )
-                )
-            return channels
+            return parse_channel_list(resp.parsed)
         except Exception as e:
+            self._reusable = False
             logger.error(f"获取频道列表失败: {e}")
             return []
 
@@ -211,6 +330,7 @@ class TS3Client:
                 return resp.parsed[0]
             return None
         except Exception as e:
+            self._reusable = False
             logger.error(f"获取服务器信息失败: {e}")
             return None
 
@@ -226,20 +346,7 @@ class TS3Client:
 
         clients = self.get_client_list()
         channels = self.get_channel_list()
-
-        # 使用过滤后的客户端列表长度，而非服务器报告的数值
-        # 因为服务器报告的数值包含 ServerQuery 连接，可能有多个
-        return ServerStatus(
-            name=server_info.get("virtualserver_name", "Unknown"),
-            platform=server_info.get("virtualserver_platform", "Unknown"),
-            version=server_info.get("virtualserver_version", "Unknown"),
-            clients_online=len(clients),  # 使用实际过滤后的客户端数量
-            max_clients=int(server_info.get("virtualserver_maxclients", 0)),
-            channels_online=int(server_info.get("virtualserver_channelsonline", 0)),
-            uptime=int(server_info.get("virtualserver_uptime", 0)),
-            clients=clients,
-            channels=channels,
-        )
+        return build_server_status(server_info, clients, channels)
 
     def __enter__(self) -> "TS3Client":
         """上下文管理器入口
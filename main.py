@@ -5,15 +5,24 @@
 
 import asyncio
 import time
-from dataclasses import dataclass
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, TypeVar
 
 from astrbot.api import logger, star
 from astrbot.api.event import AstrMessageEvent, filter
 
-from .core import TS3_AVAILABLE, Notifier, TS3Client, TS3Monitor
+from .core import TS3_AVAILABLE, Notifier, TS3Client, TS3Monitor, default_pool
 from .core.ts3_client import ClientInfo, ServerStatus
 from .models import ServerInfo
-from .storage import DataManager
+from .storage import DataManager, SubscriberSets
+
+T = TypeVar("T")
+
+# 开关命令参数，其他值表示切换当前状态
+TOGGLE_MAP = {"on": True, "off": False}
 
 
 @dataclass
@@ -42,42 +51,60 @@ class Main(star.Star):
     - /ts restart [别名] - 重启监控（管理员）
     """
 
+    # 单条通知的最大发送尝试次数
+    MAX_NOTIFICATION_RETRIES = 5
+    # 通知队列容量，积压超过时丢弃最旧的通知
+    NOTIFICATION_QUEUE_SIZE = 1024
+    # 每批最多合并处理的通知数
+    NOTIFICATION_BATCH_SIZE = 64
+    # 重试退避上限（秒）
+    MAX_RETRY_DELAY = 60
+    # 同步 ServerQuery 查询（/ts add、/ts status）使用的线程数
+    BLOCKING_WORKERS = 4
+    # 状态消息文本的复用时间（秒）
+    STATUS_TEXT_TTL = 5
+
     def __init__(self, context: star.Context) -> None:
         super().__init__(context)
         self.context = context
 
-        # 主事件循环引用（用于子线程回调）
-        self.loop: asyncio.AbstractEventLoop | None = None
-
         # 初始化模块
         self.data = DataManager()
         self.notifier = Notifier(context)
         self.monitors: dict[str, TS3Monitor] = {}
+        # 同步 ts3 库调用使用独立线程池，不占用事件循环的默认线程池
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.BLOCKING_WORKERS, thread_name_prefix="ts3-query"
+        )
 
         # 通知队列（使用 asyncio.Queue 实现零延迟异步处理）
         self._notification_queue: asyncio.Queue[PendingNotification] | None = None
         self._queue_processor_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()  # 后台任务（如等待重试的通知）
+
+        # 通知目标缓存：server_name -> (来源集合, 加入, 离开, 状态)
+        # 缓存的字典会直接交给通知队列，只可读取不可修改
+        self._subscriber_cache: dict[
+            str, tuple[SubscriberSets, dict[str, bool], dict[str, bool], dict[str, bool]]
+        ] = {}
+        # 状态消息文本缓存：server_name -> (生成时间, 状态对象, 文本)
+        self._status_text_cache: dict[str, tuple[float, ServerStatus, str]] = {}
 
     async def initialize(self) -> None:
         """插件激活时启动所有监控"""
-        try:
-            self.loop = asyncio.get_running_loop()
-        except RuntimeError:
-            self.loop = asyncio.get_event_loop()
-
         if not TS3_AVAILABLE:
             logger.error("ts3 库未安装，TeamSpeak 监控插件无法正常工作")
             return
 
         # 初始化 asyncio.Queue（必须在事件循环中创建）
-        self._notification_queue = asyncio.Queue()
+        self._notification_queue = asyncio.Queue(maxsize=self.NOTIFICATION_QUEUE_SIZE)
 
         # 启动通知队列处理任务
         self._queue_processor_task = asyncio.create_task(self._process_notification_queue())
 
         # 启动所有已保存服务器的监控
-        for server_name in self.data.server_info.keys():
-            self._start_monitor(server_name)
+        for server_name, server_info in self.data.get_all_servers_view().items():
+            self._start_monitor(server_name, server_info=server_info)
 
         logger.info(f"TeamSpeak 监控插件已启动，监控 {len(self.monitors)} 个服务器")
 
@@ -90,24 +117,50 @@ class Main(star.Star):
             except asyncio.CancelledError:
                 pass
 
-        # 使用 run_in_executor 避免 thread.join 阻塞事件循环
-        loop = asyncio.get_running_loop()
-        for monitor in self.monitors.values():
-            await loop.run_in_executor(None, monitor.stop)
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks.clear()
+
+        await asyncio.gather(*(monitor.stop() for monitor in self.monitors.values()))
         self.monitors.clear()
-        self.data.save()
+        await self._run_blocking(default_pool.close_all)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.data.close()
         logger.info("TeamSpeak 监控插件已停止")
 
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """启动后台任务：持有引用直至结束，异常写入日志而不是被静默丢弃"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        """后台任务结束回调"""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.error(f"后台任务出错: {exc}", exc_info=exc)
+
+    async def _run_blocking(self, func: Callable[[], T]) -> T:
+        """在插件线程池中执行阻塞调用"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func)
+
     # ==================== 监控管理 ====================
 
-    def _start_monitor(self, server_name: str) -> bool:
-        """启动单个服务器的监控"""
+    def _start_monitor(self, server_name: str, *, server_info: ServerInfo | None = None) -> bool:
+        """启动单个服务器的监控
+
+        Args:
+            server_name: 服务器别名
+            server_info: 已查到的服务器信息，省略时从数据管理器读取
+        """
         if server_name in self.monitors:
             return True
 
-        server_info = self.data.get_server(server_name)
-        if not server_info:
-            return False
+        if server_info is None:
+            server_info = self.data.get_server(server_name)
+            if not server_info:
+                return False
 
         monitor = TS3Monitor(
             server_name=server_name,
@@ -126,45 +179,91 @@ class Main(star.Star):
             return True
         return False
 
-    def _stop_monitor(self, server_name: str) -> None:
+    async def _stop_monitor(self, server_name: str) -> None:
         """停止单个服务器的监控"""
-        if server_name in self.monitors:
-            self.monitors[server_name].stop()
-            del self.monitors[server_name]
+        if monitor := self.monitors.pop(server_name, None):
+            await monitor.stop()
 
     async def _process_notification_queue(self) -> None:
-        """处理通知队列的后台任务（使用 asyncio.Queue 实现零延迟）"""
-        MAX_RETRIES = 5
+        """处理通知队列的后台任务（使用 asyncio.Queue 实现零延迟）
+
+        每次取出队列中所有已积压的通知，发往同一批订阅者的通知合并为一条，
+        不同批次并发发送。
+        """
         while True:
             try:
                 # 直接 await，无需轮询
-                item = await self._notification_queue.get()
+                items = [await self._notification_queue.get()]
+                while (
+                    len(items) < self.NOTIFICATION_BATCH_SIZE
+                    and not self._notification_queue.empty()
+                ):
+                    items.append(self._notification_queue.get_nowait())
 
                 try:
-                    await self.notifier.send_to_subscribers(
-                        item.subscriber_settings, item.message
-                    )
-                except Exception as e:
-                    item.retry_count += 1
-                    if item.retry_count < MAX_RETRIES:
-                        await self._notification_queue.put(item)
-                        logger.warning(
-                            f"发送通知失败，将重试 ({item.retry_count}/{MAX_RETRIES}): {e}"
-                        )
-                    else:
-                        logger.error(f"发送通知失败，已达最大重试次数: {e}")
+                    await self._send_batch(items)
                 finally:
-                    self._notification_queue.task_done()
+                    for _ in items:
+                        self._notification_queue.task_done()
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"通知队列处理器出错: {e}")
 
+    async def _send_batch(self, items: list[PendingNotification]) -> None:
+        """按订阅者设置分组合并通知并并发发送，发送失败的订阅者退避后重新入队
+
+        Args:
+            items: 待发送的通知
+        """
+        if len(items) == 1:
+            # 常见情况：队列中只有一条通知，无需分组
+            batches = [items]
+        else:
+            groups: dict[frozenset, list[PendingNotification]] = {}
+            for item in items:
+                groups.setdefault(frozenset(item.subscriber_settings.items()), []).append(item)
+            batches = list(groups.values())
+
+        results = await self.notifier.send_batch(
+            [
+                (
+                    batch[0].subscriber_settings,
+                    # 相同内容只保留一份，保持原有顺序
+                    batch[0].message
+                    if len(batch) == 1
+                    else "\n".join(dict.fromkeys(item.message for item in batch)),
+                )
+                for batch in batches
+            ]
+        )
+
+        for batch, failed in zip(batches, results):
+            if not failed:
+                continue
+            for item in batch:
+                # 只重发给失败的订阅者，已成功的不会收到重复消息
+                retry = replace(item, subscriber_settings=failed, retry_count=item.retry_count + 1)
+                if retry.retry_count < self.MAX_NOTIFICATION_RETRIES:
+                    delay = min(2**retry.retry_count, self.MAX_RETRY_DELAY)
+                    self._spawn(self._retry_later(retry, delay))
+                    logger.warning(
+                        f"发送通知失败 ({len(failed)} 个订阅者)，{delay}秒后重试 "
+                        f"({retry.retry_count}/{self.MAX_NOTIFICATION_RETRIES})"
+                    )
+                else:
+                    logger.error(f"发送通知失败 ({len(failed)} 个订阅者)，已达最大重试次数")
+
+    async def _retry_later(self, item: PendingNotification, delay: float) -> None:
+        """等待退避时间后将通知重新入队"""
+        await asyncio.sleep(delay)
+        self._enqueue(item)
+
     def _schedule_notification(
         self, subscriber_settings: dict[str, bool], message: str
     ) -> None:
-        """安全地调度通知发送（从监控线程调用）"""
+        """调度通知发送（监控器回调在事件循环中执行，直接入队）"""
         if not subscriber_settings:
             return
 
@@ -172,31 +271,70 @@ class Main(star.Star):
             logger.warning("通知队列未初始化")
             return
 
-        notification = PendingNotification(
-            subscriber_settings=subscriber_settings, message=message
+        self._enqueue(PendingNotification(subscriber_settings=subscriber_settings, message=message))
+
+    def _enqueue(self, item: PendingNotification) -> None:
+        """通知入队，队列已满时丢弃最旧的一条"""
+        queue = self._notification_queue
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            dropped = queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+            logger.warning(f"通知队列已满，丢弃最旧的通知: {dropped.message[:30]!r}")
+
+    def _get_subscribers(
+        self, server_name: str
+    ) -> tuple[dict[str, bool], dict[str, bool], dict[str, bool]]:
+        """获取按通知类型划分的订阅者（订阅数据未变更时直接返回缓存）
+
+        Args:
+            server_name: 服务器别名
+
+        Returns:
+            (加入通知订阅者, 离开通知订阅者, 状态通知订阅者)，均为 {umo -> at_all}
+        """
+        sets = self.data.get_subscriber_sets(server_name)
+        cached = self._subscriber_cache.get(server_name)
+        if cached is not None and cached[0] is sets:
+            return cached[1:]
+
+        # 加入/离开通知不 @全体
+        join_subscribers = dict.fromkeys(sets.join, False)
+        leave_subscribers = dict.fromkeys(sets.leave, False)
+        status_subscribers = {umo: umo in sets.at_all for umo in sets.status}
+        self._subscriber_cache[server_name] = (
+            sets,
+            join_subscribers,
+            leave_subscribers,
+            status_subscribers,
         )
+        return join_subscribers, leave_subscribers, status_subscribers
 
-        if self.loop and self.loop.is_running():
-            # 使用 call_soon_threadsafe 将通知安全地放入 asyncio.Queue
-            self.loop.call_soon_threadsafe(
-                self._notification_queue.put_nowait, notification
-            )
-        else:
-            logger.warning("事件循环不可用，无法发送通知")
+    def _status_text(self, server_name: str, status: ServerStatus) -> str:
+        """构建状态消息，同一状态对象在短时间内复用已生成的文本
 
-    def _on_client_join(self, server_name: str, client: ClientInfo) -> None:
-        """用户加入回调"""
-        sub_configs = self.data.get_all_subscription_configs(server_name)
-        if not sub_configs:
-            return
+        监控的状态查询带有缓存，定时推送与 /ts status 可能拿到同一个状态对象。
 
-        # 筛选开启加入通知的订阅者
-        join_subscribers = {
-            umo: False  # 加入通知不 @全体
-            for umo, config in sub_configs.items()
-            if config.notify_join
-        }
+        Args:
+            server_name: 服务器别名
+            status: 服务器状态
+
+        Returns:
+            格式化的状态消息
+        """
+        now = time.monotonic()
+        cached = self._status_text_cache.get(server_name)
+        if cached is not None and cached[1] is status and now - cached[0] < self.STATUS_TEXT_TTL:
+            return cached[2]
+        text = self.notifier.build_status_notification(server_name, status)
+        self._status_text_cache[server_name] = (now, status, text)
+        return text
 
+    def _on_client_join(self, server_name: str, client: ClientInfo) -> None:
+        """用户加入回调"""
+        join_subscribers = self._get_subscribers(server_name)[0]
         if not join_subscribers:
             return
 
@@ -205,17 +343,7 @@ class Main(star.Star):
 
     def _on_client_leave(self, server_name: str, client: ClientInfo) -> None:
         """用户离开回调"""
-        sub_configs = self.data.get_all_subscription_configs(server_name)
-        if not sub_configs:
-            return
-
-        # 筛选开启离开通知的订阅者
-        leave_subscribers = {
-            umo: False  # 离开通知不 @全体
-            for umo, config in sub_configs.items()
-            if config.notify_leave
-        }
-
+        leave_subscribers = self._get_subscribers(server_name)[1]
         if not leave_subscribers:
             return
 
@@ -229,24 +357,42 @@ class Main(star.Star):
             server_name: 服务器别名
             status: 服务器状态（由 Monitor 传入，复用现有连接获取）
         """
-        sub_configs = self.data.get_all_subscription_configs(server_name)
-        if not sub_configs:
-            return
-
-        # 筛选开启状态通知的订阅者
-        status_subscribers = {
-            umo: config.at_all
-            for umo, config in sub_configs.items()
-            if config.notify_status
-        }
-
+        status_subscribers = self._get_subscribers(server_name)[2]
         if not status_subscribers:
             return
 
         # 直接使用传入的状态，无需创建新连接
-        notification = self.notifier.build_status_notification(server_name, status)
+        notification = self._status_text(server_name, status)
         self._schedule_notification(status_subscribers, notification)
 
+    def _toggle(
+        self, event: AstrMessageEvent, alias: str, enable: str, field: str, label: str
+    ) -> str:
+        """切换当前群订阅配置中的开关
+
+        Args:
+            event: 消息事件
+            alias: 服务器别名
+            enable: on/off 或留空切换状态
+            field: SubscriptionConfig 字段名
+            label: 回复中显示的开关名称
+
+        Returns:
+            回复消息
+        """
+        if not self.data.has_server(alias):
+            return f"⚠️ 服务器 {alias} 不存在"
+
+        umo = event.unified_msg_origin
+        config = self.data.get_subscription_config(alias, umo)
+        if not config:
+            return f"⚠️ 当前群还没有订阅服务器 {alias}"
+
+        new_status = TOGGLE_MAP.get(enable.lower(), not getattr(config, field))
+        self.data.update_subscription_config(alias, umo, **{field: new_status})
+        status_text = "开启" if new_status else "关闭"
+        return f"✅ 服务器 {alias} 的{label}已{status_text}"
+
     # ==================== 命令组 ====================
 
     @filter.command_group("ts")
@@ -294,7 +440,7 @@ class Main(star.Star):
         )
 
         # 同步操作放入线程池执行
-        connected = await asyncio.to_thread(client.connect)
+        connected = await self._run_blocking(client.connect)
         if not connected:
             yield event.plain_result(
                 "❌ 无法连接到服务器\n"
@@ -303,8 +449,8 @@ class Main(star.Star):
             return
 
         # 获取服务器名称
-        server_status = await asyncio.to_thread(client.get_server_status)
-        await asyncio.to_thread(client.disconnect)
+        server_status = await self._run_blocking(client.get_server_status)
+        await self._run_blocking(client.disconnect)
 
         if not server_status:
             yield event.plain_result("❌ 无法获取服务器信息")
@@ -319,7 +465,7 @@ class Main(star.Star):
             query_password=password,
             virtual_server_id=vsid,
             added_by=event.get_sender_id(),
-            added_time=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+            added_time=datetime.now().isoformat(sep=" ", timespec="seconds"),
             status_interval=60,
         )
         self.data.add_server(info)
@@ -345,30 +491,32 @@ class Main(star.Star):
             yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
             return
 
-        self._stop_monitor(alias)
+        await self._stop_monitor(alias)
         self.data.remove_server(alias)
+        self._subscriber_cache.pop(alias, None)
+        self._status_text_cache.pop(alias, None)
+        self.notifier.forget_server(alias)
         yield event.plain_result(f"✅ 已删除服务器 {alias} 的监控")
 
     @ts.command("ls")
     async def ts_ls(self, event: AstrMessageEvent):
         """查看监控列表"""
-        servers = self.data.get_all_servers()
+        servers = self.data.get_all_servers_view()
         if not servers:
             yield event.plain_result("📋 当前没有监控的服务器\n使用 /ts add 添加")
             return
 
-        lines = ["📋 TeamSpeak 服务器监控列表", "━━━━━━━━━━━━━━"]
-        for idx, (name, info) in enumerate(servers.items(), 1):
-            sub_count = len(self.data.get_subscribers(name))
-            status = "🟢 运行中" if name in self.monitors and self.monitors[name].running else "🔴 已停止"
-            lines.append(
-                f"{idx}. {name}\n"
-                f"   地址: {info.host}:{info.query_port}\n"
-                f"   订阅数: {sub_count}\n"
-                f"   状态: {status}"
-            )
+        monitors = self.monitors
+        body = "\n".join(
+            f"{idx}. {name}\n"
+            f"   地址: {info.host}:{info.query_port}\n"
+            f"   订阅数: {len(self.data.get_subscribers(name))}\n"
+            f"   状态: "
+            f"{'🟢 运行中' if (m := monitors.get(name)) is not None and m.running else '🔴 已停止'}"
+            for idx, (name, info) in enumerate(servers.items(), 1)
+        )
 
-        yield event.plain_result("\n".join(lines))
+        yield event.plain_result(f"📋 TeamSpeak 服务器监控列表\n━━━━━━━━━━━━━━\n{body}")
 
     @ts.command("sub")
     async def ts_sub(self, event: AstrMessageEvent, alias: str):
@@ -385,7 +533,7 @@ class Main(star.Star):
             yield event.plain_result(f"⚠️ 你已经订阅了服务器 {alias}")
             return
 
-        is_running = alias in self.monitors and self.monitors[alias].running
+        is_running = (monitor := self.monitors.get(alias)) is not None and monitor.running
         status_tip = "" if is_running else "\n⚠️ 注意: 该服务器监控未运行"
 
         yield event.plain_result(
@@ -466,6 +614,17 @@ class Main(star.Star):
             yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
             return
 
+        # 监控运行中时复用其已登录的连接
+        if monitor := self.monitors.get(alias):
+            try:
+                status = await monitor.get_status()
+            except Exception as e:
+                logger.warning(f"通过监控连接获取 {alias} 状态失败: {e}")
+                status = None
+            if status:
+                yield event.plain_result(self._status_text(alias, status))
+                return
+
         # 获取实时状态（使用线程池避免阻塞事件循环）
         client = TS3Client(
             host=server_info.host,
@@ -476,20 +635,20 @@ class Main(star.Star):
         )
 
         # 同步操作放入线程池执行
-        connected = await asyncio.to_thread(client.connect)
+        connected = await self._run_blocking(client.connect)
         if not connected:
             yield event.plain_result(f"❌ 无法连接到服务器 {alias}")
             return
 
         try:
-            status = await asyncio.to_thread(client.get_server_status)
+            status = await self._run_blocking(client.get_server_status)
             if status:
-                notification = self.notifier.build_status_notification(alias, status)
+                notification = self._status_text(alias, status)
                 yield event.plain_result(notification)
             else:
                 yield event.plain_result(f"❌ 无法获取服务器 {alias} 的状态")
         finally:
-            await asyncio.to_thread(client.disconnect)
+            await self._run_blocking(client.disconnect)
 
     @ts.command("join")
     @filter.permission_type(filter.PermissionType.ADMIN)
@@ -500,26 +659,7 @@ class Main(star.Star):
             alias: 服务器别名
             enable: on/off 或留空切换状态
         """
-        if not self.data.has_server(alias):
-            yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
-            return
-
-        umo = event.unified_msg_origin
-        config = self.data.get_subscription_config(alias, umo)
-        if not config:
-            yield event.plain_result(f"⚠️ 当前群还没有订阅服务器 {alias}")
-            return
-
-        if enable.lower() == "on":
-            new_status = True
-        elif enable.lower() == "off":
-            new_status = False
-        else:
-            new_status = not config.notify_join
-
-        self.data.update_subscription_config(alias, umo, notify_join=new_status)
-        status_text = "开启" if new_status else "关闭"
-        yield event.plain_result(f"✅ 服务器 {alias} 的加入通知已{status_text}")
+        yield event.plain_result(self._toggle(event, alias, enable, "notify_join", "加入通知"))
 
     @ts.command("leave")
     @filter.permission_type(filter.PermissionType.ADMIN)
@@ -530,26 +670,7 @@ class Main(star.Star):
             alias: 服务器别名
             enable: on/off 或留空切换状态
         """
-        if not self.data.has_server(alias):
-            yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
-            return
-
-        umo = event.unified_msg_origin
-        config = self.data.get_subscription_config(alias, umo)
-        if not config:
-            yield event.plain_result(f"⚠️ 当前群还没有订阅服务器 {alias}")
-            return
-
-        if enable.lower() == "on":
-            new_status = True
-        elif enable.lower() == "off":
-            new_status = False
-        else:
-            new_status = not config.notify_leave
-
-        self.data.update_subscription_config(alias, umo, notify_leave=new_status)
-        status_text = "开启" if new_status else "关闭"
-        yield event.plain_result(f"✅ 服务器 {alias} 的离开通知已{status_text}")
+        yield event.plain_result(self._toggle(event, alias, enable, "notify_leave", "离开通知"))
 
     @ts.command("interval")
     @filter.permission_type(filter.PermissionType.ADMIN)
@@ -571,8 +692,8 @@ class Main(star.Star):
         self.data.update_server(alias, status_interval=minutes)
 
         # 更新运行中的监控器
-        if alias in self.monitors:
-            self.monitors[alias].update_status_interval(minutes)
+        if monitor := self.monitors.get(alias):
+            monitor.update_status_interval(minutes)
 
         yield event.plain_result(f"✅ 服务器 {alias} 的状态推送间隔已设为 {minutes} 分钟")
 
@@ -589,23 +710,21 @@ class Main(star.Star):
                 yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
                 return
 
-            self._stop_monitor(alias)
+            await self._stop_monitor(alias)
             if self._start_monitor(alias):
                 yield event.plain_result(f"✅ 服务器 {alias} 监控已重启")
             else:
                 yield event.plain_result(f"❌ 服务器 {alias} 监控重启失败")
         else:
-            # 重启所有
-            success = 0
-            for name in list(self.data.server_info.keys()):
-                self._stop_monitor(name)
-                if self._start_monitor(name):
-                    success += 1
-
-            yield event.plain_result(
-                f"✅ 已重启 {success}/{len(self.data.server_info)} 个服务器监控"
+            # 重启所有：并发停止，再逐个启动（启动只创建任务，不会阻塞）
+            servers = self.data.get_all_servers()
+            await asyncio.gather(*(self._stop_monitor(name) for name in servers))
+            success = sum(
+                1 for name, info in servers.items() if self._start_monitor(name, server_info=info)
             )
 
+            yield event.plain_result(f"✅ 已重启 {success}/{len(servers)} 个服务器监控")
+
     @ts.command("atall")
     @filter.permission_type(filter.PermissionType.ADMIN)
     async def ts_atall(self, event: AstrMessageEvent, alias: str, enable: str = ""):
@@ -615,23 +734,4 @@ class Main(star.Star):
             alias: 服务器别名
             enable: on/off 或留空切换状态
         """
-        if not self.data.has_server(alias):
-            yield event.plain_result(f"⚠️ 服务器 {alias} 不存在")
-            return
-
-        umo = event.unified_msg_origin
-        config = self.data.get_subscription_config(alias, umo)
-        if not config:
-            yield event.plain_result(f"⚠️ 当前群还没有订阅服务器 {alias}")
-            return
-
-        if enable.lower() == "on":
-            new_status = True
-        elif enable.lower() == "off":
-            new_status = False
-        else:
-            new_status = not config.at_all
-
-        self.data.update_subscription_config(alias, umo, at_all=new_status)
-        status_text = "开启" if new_status else "关闭"
-        yield event.plain_result(f"✅ 服务器 {alias} 的状态推送 @全体 已{status_text}")
+        yield event.plain_result(self._toggle(event, alias, enable, "at_all", "状态推送 @全体 "))
@@ -1,6 +1,6 @@
 """服务器信息数据模型"""
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from typing import Any
 
 from ..utils.constants import (
@@ -10,7 +10,7 @@ from ..utils.constants import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerInfo:
     """TS3 服务器信息
 
@@ -26,10 +26,10 @@ class ServerInfo:
         status_interval: 状态推送间隔（分钟）
     """
 
-    name: str
-    host: str
-    query_user: str
-    query_password: str
+    name: str = ""
+    host: str = ""
+    query_user: str = ""
+    query_password: str = ""
     query_port: int = DEFAULT_QUERY_PORT
     virtual_server_id: int = DEFAULT_VIRTUAL_SERVER_ID
     added_by: str = ""
@@ -38,20 +38,22 @@ class ServerInfo:
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            "name": self.name,
+            "host": self.host,
+            "query_user": self.query_user,
+            "query_password": self.query_password,
+            "query_port": self.query_port,
+            "virtual_server_id": self.virtual_server_id,
+            "added_by": self.added_by,
+            "added_time": self.added_time,
+            "status_interval": self.status_interval,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ServerInfo":
-        """从字典创建实例"""
-        return cls(
-            name=data.get("name", ""),
-            host=data.get("host", ""),
-            query_user=data.get("query_user", ""),
-            query_password=data.get("query_password", ""),
-            query_port=data.get("query_port", DEFAULT_QUERY_PORT),
-            virtual_server_id=data.get("virtual_server_id", DEFAULT_VIRTUAL_SERVER_ID),
-            added_by=data.get("added_by", ""),
-            added_time=data.get("added_time", ""),
-            status_interval=data.get("status_interval", DEFAULT_STATUS_INTERVAL),
-        )
+        """从字典创建实例（忽略未知字段，缺失字段使用默认值）"""
+        return cls(**{k: v for k, v in data.items() if k in _SERVER_FIELDS})
 
+
+_SERVER_FIELDS = frozenset(f.name for f in fields(ServerInfo))
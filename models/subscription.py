@@ -1,14 +1,14 @@
 """订阅配置数据模型"""
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SubscriptionConfig:
     """订阅配置
 
-    每个群对每个服务器的独立配置。
+    每个群对每个服务器的独立配置。实例不可变，修改时使用 dataclasses.replace 创建新实例。
 
     Attributes:
         notify_join: 是否推送用户加入通知
@@ -24,14 +24,17 @@ class SubscriptionConfig:
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            "notify_join": self.notify_join,
+            "notify_leave": self.notify_leave,
+            "notify_status": self.notify_status,
+            "at_all": self.at_all,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SubscriptionConfig":
-        """从字典创建实例"""
-        return cls(
-            notify_join=data.get("notify_join", True),
-            notify_leave=data.get("notify_leave", True),
-            notify_status=data.get("notify_status", True),
-            at_all=data.get("at_all", False),
-        )
+        """从字典创建实例（忽略未知字段，缺失字段使用默认值）"""
+        return cls(**{k: v for k, v in data.items() if k in _SUBSCRIPTION_FIELDS})
+
+
+_SUBSCRIPTION_FIELDS = frozenset(f.name for f in fields(SubscriptionConfig))
@@ -1,5 +1,5 @@
 """Storage module exports"""
 
-from .data_manager import DataManager
+from .data_manager import DataManager, SubscriberSets
 
-__all__ = ["DataManager"]
+__all__ = ["DataManager", "SubscriberSets"]
@@ -2,29 +2,114 @@
 
 from __future__ import annotations
 
+import contextlib
+import dataclasses
+import gzip
+import hashlib
 import json
+import mmap
 import os
+import queue
+import sys
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
-from threading import RLock
-from typing import TYPE_CHECKING, Any
+from threading import Lock, RLock, Thread
+from types import MappingProxyType
+from typing import Any
+from urllib.parse import quote
 
 from astrbot.api import logger
 from astrbot.api.star import StarTools
 
-if TYPE_CHECKING:
-    from ..models.server import ServerInfo
-    from ..models.subscription import SubscriptionConfig
+from ..models.server import ServerInfo
+from ..models.subscription import SubscriptionConfig
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+
+# 缺省值哨兵，用于区分"键不存在"与值为 None
+_MISSING: Any = object()
+# 通知后台写入线程退出
+_STOP_WRITER = object()
+
+# 序列化结果超过该大小时以 gzip 压缩写入（文件名不变，读取时按魔数识别）
+GZIP_THRESHOLD = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+# 超过该大小的文件使用 mmap 读取（需要 orjson，标准库 json 不支持直接解析内存视图）
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def _json_dumps(data: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON（优先使用 orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes | memoryview) -> Any:
+    """解析 UTF-8 JSON，自动解压 gzip 压缩的内容（优先使用 orjson）"""
+    if raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(path: Path) -> Any:
+    """读取并解析 JSON 文件
+
+    文件较大且 orjson 可用时通过 mmap 直接解析，省去读入内存的整块复制；
+    小文件直接读取，避免映射的额外开销。
+    """
+    with open(path, "rb") as f:
+        if not ORJSON_AVAILABLE or os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return _json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _json_loads(view)
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class SubscriberSets:
+    """按通知类型划分的订阅者（unified_msg_origin）集合"""
+
+    join: frozenset[str]  # 接收加入通知
+    leave: frozenset[str]  # 接收离开通知
+    status: frozenset[str]  # 接收状态推送
+    at_all: frozenset[str]  # 状态推送时 @全体
 
 
 class DataManager:
     """数据管理器
 
     负责插件数据的加载、保存和管理。
-    数据存储在 JSON 文件中。
+    服务器列表存储在索引文件 ts3_data.json 中，
+    每个服务器的订阅单独存储在 subs/<服务器别名>-<摘要>.json 中，修改时只重写变更的文件。
+
+    启动时只读取索引文件，各服务器的订阅在首次访问时才读取和解析。
+    跨服务器的查询（get_user_subscriptions、get_total_subscriptions）需要全部订阅数据，
+    首次调用时会读取所有订阅文件。
 
-    该类是线程安全的，使用 RLock 保护所有数据访问。
+    该类是线程安全的：每个服务器的订阅由其所在分段的锁保护，不同服务器的操作互不阻塞；
+    服务器信息与保存状态由元数据锁保护。需要同时持有两者时，先取分段锁再取元数据锁。
+    服务器与订阅的只读查询不加锁，依赖 GIL 下单次 dict 操作的原子性（订阅查询另以结构修改代数校验）。
+    修改操作只标记数据已变更，由后台写入线程在短暂延迟后合并为一次写入；停止前需调用 close()。
     """
 
+    # 延迟保存时间（秒），期间的多次修改合并为一次写入
+    SAVE_DELAY = 0.2
+    # 保存失败后再次尝试前的等待时间（秒）
+    SAVE_RETRY_DELAY = 5.0
+    # 订阅锁分段数
+    LOCK_STRIPES = 16
+    # 无锁读取的最大尝试次数，超过后回退到加锁读取
+    OPTIMISTIC_READ_SPINS = 3
+
     def __init__(self, plugin_name: str = "astrbot_plugin_tsserver_relay"):
         """初始化数据管理器
 
@@ -32,81 +117,340 @@ class DataManager:
             plugin_name: 插件名称，用于确定数据目录
         """
         self.data_dir: Path = StarTools.get_data_dir(plugin_name)
-        self.data_file: Path = self.data_dir / "ts3_data.json"
+        self.data_file: Path = self.data_dir / "ts3_data.json"  # 索引文件（服务器信息）
+        self.subs_dir: Path = self.data_dir / "subs"  # 每个服务器一个订阅文件
 
         # 线程锁，使用 RLock 支持同一线程多次获取
-        self._lock = RLock()
+        # 分段锁：按服务器别名哈希选取，保护该服务器的订阅数据
+        self._stripes = [RLock() for _ in range(self.LOCK_STRIPES)]
+        # 元数据锁：保护服务器信息、延迟保存状态及整体加载
+        self._meta_lock = RLock()
+        # 结构修改代数（增删服务器、重新加载时前后各加一，奇数表示修改进行中），供无锁读取校验
+        self._gen = 0
+        # 串行化文件写入，保证较新的快照不会被较旧的覆盖
+        self._write_lock = Lock()
+        # 保存时复用的序列化缓冲区，仅在持有 _write_lock 时使用
+        self._subs_buf: dict[str, dict[str, Any]] = {}
+        self._index_buf: dict[str, dict[str, dict[str, Any]]] = {"server_info": {}}
+        # 各文件最近一次写入内容的摘要，内容未变时跳过写入（仅在持有 _write_lock 时使用）
+        self._written_hashes: dict[Path, bytes] = {}
+
+        # 延迟保存状态
+        self._index_dirty = False  # 服务器信息待保存
+        self._dirty_servers: set[str] = set()  # 订阅待保存的服务器
+        self._save_queued = False  # 已向写入线程提交保存请求、尚未开始写入
+        self._save_queue: queue.SimpleQueue[object] = queue.SimpleQueue()
 
         # 数据结构
         # server_name -> {umo -> SubscriptionConfig}
         self.subscriptions: dict[str, dict[str, SubscriptionConfig]] = {}
         self.server_info: dict[str, ServerInfo] = {}  # server_name -> ServerInfo
+        # 尚未解析的订阅数据：server_name -> 原始 JSON（None 表示尚未读取订阅文件）
+        # 首次访问时由 _ensure_loaded 转换并移入 subscriptions
+        self._raw_subs: dict[str, Any] = {}
+
+        # 反向索引：umo -> 已订阅的服务器别名集合（仅包含已加载的服务器）
+        self._user_index: dict[str, set[str]] = {}
+        # 订阅总数（仅统计已加载的服务器），与反向索引同步维护
+        self._total_subs = 0
+        self._user_index_lock = Lock()
+
+        # 按通知类型划分的订阅者集合：server_name -> SubscriberSets
+        # 订阅变更时丢弃，下次读取时重建
+        self._partitions: dict[str, SubscriberSets] = {}
+
+        # 后台写入线程，文件编码与落盘不占用调用方线程
+        self._writer = Thread(target=self._writer_loop, name="ts3-data-writer", daemon=True)
+        self._writer.start()
 
         # 加载数据
         self.load()
 
     def load(self) -> None:
-        """从文件加载数据"""
-        from ..models.server import ServerInfo as ServerInfoClass
-        from ..models.subscription import SubscriptionConfig as SubConfigClass
+        """从文件加载数据
+
+        兼容旧版单文件格式（订阅数据存放在索引文件中），加载后自动迁移为分文件存储。
+        """
+        with self._hold_all_locks(), self._structural_change():
+            self._partitions.clear()
+            self._user_index = {}
+            self._total_subs = 0
+            # 文件可能已在外部修改，不再信任之前记录的摘要
+            self._written_hashes.clear()
+            self._index_dirty = False
+            self._dirty_servers.clear()
+            self.subscriptions = {}
+            self._raw_subs = {}
 
-        with self._lock:
             if not os.path.exists(self.data_file):
-                self.subscriptions = {}
                 self.server_info = {}
                 return
 
             try:
-                with open(self.data_file, encoding="utf-8") as f:
-                    data = json.load(f)
-
-                    # 加载服务器信息
-                    self.server_info = {
-                        k: ServerInfoClass.from_dict(v)
-                        for k, v in data.get("server_info", {}).items()
-                    }
+                data = _read_json(self.data_file)
 
-                    # 加载订阅数据
-                    raw_subs = data.get("subscriptions", {})
-                    self.subscriptions = {}
+                # 加载服务器信息
+                self.server_info = {
+                    sys.intern(k): ServerInfo.from_dict(v)
+                    for k, v in data.get("server_info", {}).items()
+                }
 
-                    for server_name, sub_data in raw_subs.items():
-                        self.subscriptions[server_name] = {}
-                        if isinstance(sub_data, dict):
-                            for umo, config in sub_data.items():
-                                if isinstance(config, dict):
-                                    self.subscriptions[server_name][umo] = SubConfigClass.from_dict(config)
-                                else:
-                                    self.subscriptions[server_name][umo] = SubConfigClass()
+                # 订阅数据延迟到首次访问时解析
+                if "subscriptions" in data:
+                    # 旧版单文件格式：全部写出为分文件格式
+                    self._raw_subs = {
+                        sys.intern(k): v for k, v in data["subscriptions"].items()
+                    }
+                    logger.info("检测到旧版数据文件，将迁移为按服务器分文件存储")
+                    self._schedule_save(*self._raw_subs, index=True)
+                else:
+                    self._raw_subs = dict.fromkeys(self.server_info)
 
             except Exception as e:
                 logger.error(f"加载 TS3 数据失败: {e}")
                 self.subscriptions = {}
+                self._raw_subs = {}
                 self.server_info = {}
 
+    def _lock_for(self, server_name: str) -> RLock:
+        """获取保护指定服务器订阅数据的分段锁"""
+        return self._stripes[hash(server_name) % self.LOCK_STRIPES]
+
+    @contextlib.contextmanager
+    def _hold_all_locks(self) -> Iterator[None]:
+        """按固定顺序获取全部分段锁及元数据锁（用于整体加载）"""
+        with contextlib.ExitStack() as stack:
+            for lock in self._stripes:
+                stack.enter_context(lock)
+            stack.enter_context(self._meta_lock)
+            yield
+
+    @contextlib.contextmanager
+    def _structural_change(self) -> Iterator[None]:
+        """标记一次结构修改（调用方需持有元数据锁），期间的无锁读取会重试"""
+        self._gen += 1
+        try:
+            yield
+        finally:
+            self._gen += 1
+
+    def _peek_subscriptions(self, server_name: str) -> dict[str, SubscriptionConfig] | None:
+        """获取服务器的订阅字典，已加载时不加锁
+
+        读取前后代数一致即说明期间没有结构修改；单次 dict 操作在 GIL 下是原子的。
+        服务器尚未加载或多次校验失败时回退到加锁读取。
+        """
+        for _ in range(self.OPTIMISTIC_READ_SPINS):
+            gen = self._gen
+            if gen & 1:
+                continue
+            if server_name in self._raw_subs:
+                break
+            subs = self.subscriptions.get(server_name)
+            if self._gen == gen:
+                return subs
+        with self._lock_for(server_name):
+            self._ensure_loaded(server_name)
+            return self.subscriptions.get(server_name)
+
+    def _ensure_loaded(self, server_name: str) -> None:
+        """确保服务器的订阅数据已解析（调用方需持有该服务器的分段锁）"""
+        raw = self._raw_subs.get(server_name, _MISSING)
+        if raw is _MISSING:
+            return
+        try:
+            if raw is None:
+                subs = self._read_subscriptions(server_name)
+            else:
+                subs = self._parse_subscriptions(raw)
+        except Exception as e:
+            logger.error(f"加载服务器 {server_name} 的订阅数据失败: {e}")
+            subs = {}
+        self.subscriptions[server_name] = subs
+        # 写入 subscriptions 后再移除原始数据，无锁读取不会看到两者都缺失的中间状态
+        del self._raw_subs[server_name]
+        self._index_add(server_name, subs)
+
+    def _ensure_all_loaded(self) -> None:
+        """确保所有服务器的订阅数据已解析（调用方不得持有元数据锁）"""
+        for server_name in list(self._raw_subs):
+            with self._lock_for(server_name):
+                self._ensure_loaded(server_name)
+
+    def _read_subscriptions(self, server_name: str) -> dict[str, SubscriptionConfig]:
+        """读取单个服务器的订阅文件
+
+        Args:
+            server_name: 服务器别名
+
+        Returns:
+            {umo -> SubscriptionConfig}，文件不存在时为空
+        """
+        path = self._subs_file(server_name)
+        if not path.exists():
+            return {}
+        return self._parse_subscriptions(_read_json(path))
+
+    @staticmethod
+    def _parse_subscriptions(sub_data: Any) -> dict[str, SubscriptionConfig]:
+        """将 JSON 订阅数据转换为配置对象
+
+        正常数据走不做逐项类型检查的快速路径，遇到格式异常的条目时再逐项校验。
+        """
+        if not isinstance(sub_data, dict):
+            return {}
+        from_dict = SubscriptionConfig.from_dict
+        intern = sys.intern
+        try:
+            # 同一订阅者出现在多个服务器中，驻留后共享同一字符串对象
+            return {intern(umo): from_dict(config) for umo, config in sub_data.items()}
+        except (AttributeError, TypeError):
+            return {
+                intern(umo): (
+                    from_dict(config) if isinstance(config, dict) else SubscriptionConfig()
+                )
+                for umo, config in sub_data.items()
+            }
+
+    def _subs_file(self, server_name: str) -> Path:
+        """服务器订阅文件路径
+
+        别名经 URL 编码避免非法文件名，并附加别名的摘要：
+        在不区分大小写的文件系统（Windows、macOS）上，仅大小写不同的别名也不会共用同一文件。
+        """
+        digest = hashlib.blake2b(server_name.encode("utf-8"), digest_size=4).hexdigest()
+        return self.subs_dir / f"{quote(server_name, safe='')}-{digest}.json"
+
     def save(self) -> None:
-        """保存数据到文件"""
-        with self._lock:
+        """立即保存全部数据到文件"""
+        self._ensure_all_loaded()
+        with self._meta_lock:
+            self._index_dirty = True
+            self._dirty_servers.update(self.subscriptions)
+        self._save_dirty()
+
+    def flush(self) -> None:
+        """立即在当前线程写入尚未保存的修改"""
+        self._save_dirty()
+
+    def close(self) -> None:
+        """写入尚未保存的修改并停止后台写入线程（插件停止时调用）"""
+        self._save_queue.put(_STOP_WRITER)
+        self._writer.join()
+        self._save_dirty()
+
+    def _schedule_save(self, *server_names: str, index: bool = False) -> None:
+        """标记数据已修改，并安排延迟保存
+
+        Args:
+            *server_names: 订阅发生变更的服务器
+            index: 服务器信息是否发生变更
+        """
+        with self._meta_lock:
+            self._dirty_servers.update(server_names)
+            self._index_dirty = self._index_dirty or index
+            if not self._save_queued:
+                self._save_queued = True
+                self._save_queue.put(None)
+
+    def _writer_loop(self) -> None:
+        """后台写入线程：收到保存请求后等待 SAVE_DELAY 合并后续修改，再写入文件"""
+        delay = self.SAVE_DELAY
+        while True:
+            token = self._save_queue.get()
+            if token is not _STOP_WRITER:
+                # 等待期间不会再有保存请求入队，只可能收到退出信号
+                try:
+                    token = self._save_queue.get(timeout=delay)
+                except queue.Empty:
+                    pass
+                with self._meta_lock:
+                    self._save_queued = False
+                # 保存失败时已重新安排保存，放慢重试以免持续出错时频繁写盘
+                delay = self.SAVE_DELAY if self._save_dirty() else self.SAVE_RETRY_DELAY
+            if token is _STOP_WRITER:
+                return
+
+    def _save_dirty(self) -> bool:
+        """只写入发生变更的文件
+
+        写入失败时，未写入的部分重新标记为已变更并安排再次保存。
+
+        Returns:
+            是否全部写入成功
+        """
+        with self._write_lock:
+            unsaved: set[str] = set()
+            index_dirty = False
             try:
+                # 在锁内生成快照，文件写入在锁外进行
+                with self._meta_lock:
+                    dirty_servers, self._dirty_servers = self._dirty_servers, set()
+                    index_dirty, self._index_dirty = self._index_dirty, False
+                    if index_dirty:
+                        index_servers = self._index_buf["server_info"]
+                        index_servers.clear()
+                        index_servers.update((k, v.to_dict()) for k, v in self.server_info.items())
+                unsaved = set(dirty_servers)
+                # 订阅配置不可变，锁内只做浅拷贝，转换为字典在锁外进行
+                # 值为 None 表示服务器已删除，需删除其订阅文件
+                server_configs: dict[str, dict[str, SubscriptionConfig] | None] = {}
+                for name in dirty_servers:
+                    with self._lock_for(name):
+                        self._ensure_loaded(name)
+                        subs = self.subscriptions.get(name)
+                        server_configs[name] = None if subs is None else subs.copy()
+
+                if not server_configs and not index_dirty:
+                    return True
+
                 # 确保目录存在
-                self.data_dir.mkdir(parents=True, exist_ok=True)
-
-                data = {
-                    "subscriptions": {
-                        server_name: {
-                            umo: config.to_dict()
-                            for umo, config in sub_dict.items()
-                        }
-                        for server_name, sub_dict in self.subscriptions.items()
-                    },
-                    "server_info": {
-                        k: v.to_dict() for k, v in self.server_info.items()
-                    },
-                }
-                with open(self.data_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                self.subs_dir.mkdir(parents=True, exist_ok=True)
+                # 先写订阅文件再写索引：迁移中途失败时旧版索引仍保留完整数据
+                buf = self._subs_buf
+                for name, configs in server_configs.items():
+                    if configs is None:
+                        path = self._subs_file(name)
+                        path.unlink(missing_ok=True)
+                        self._written_hashes.pop(path, None)
+                    else:
+                        buf.clear()
+                        buf.update((umo, config.to_dict()) for umo, config in configs.items())
+                        self._write_atomic(self._subs_file(name), buf)
+                    unsaved.discard(name)
+                if index_dirty:
+                    self._write_atomic(self.data_file, self._index_buf)
+                    index_dirty = False
+                return True
             except Exception as e:
                 logger.error(f"保存 TS3 数据失败: {e}")
+                # 未写入的变更重新标记，避免丢失
+                self._schedule_save(*unsaved, index=index_dirty)
+                return False
+
+    def _write_atomic(self, path: Path, data: Any) -> None:
+        """先写入临时文件并落盘，再原子替换目标文件，避免写入中断导致数据损坏
+
+        内容与上次写入相同时直接跳过。
+        """
+        payload = _json_dumps(data)
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        if self._written_hashes.get(path) == digest:
+            return
+        if len(payload) > GZIP_THRESHOLD:
+            payload = gzip.compress(payload, compresslevel=6)
+        tmp_file = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+            self._written_hashes[path] = digest
+        except BaseException:
+            with contextlib.suppress(OSError):
+                tmp_file.unlink()
+            raise
 
     # ==================== 服务器管理 ====================
 
@@ -116,11 +460,14 @@ class DataManager:
         Args:
             info: 服务器信息
         """
-        with self._lock:
-            self.server_info[info.name] = info
-            if info.name not in self.subscriptions:
-                self.subscriptions[info.name] = {}
-            self.save()
+        name = sys.intern(info.name)
+        with self._lock_for(name), self._meta_lock, self._structural_change():
+            self._ensure_loaded(name)
+            self.server_info[name] = info
+            if name not in self.subscriptions:
+                self.subscriptions[name] = {}
+                self._invalidate(name)
+            self._schedule_save(name, index=True)
 
     def remove_server(self, name: str) -> bool:
         """删除服务器
@@ -131,13 +478,14 @@ class DataManager:
         Returns:
             是否成功删除
         """
-        with self._lock:
-            if name not in self.server_info:
+        with self._lock_for(name), self._meta_lock, self._structural_change():
+            if self.server_info.pop(name, None) is None:
                 return False
-            del self.server_info[name]
-            if name in self.subscriptions:
-                del self.subscriptions[name]
-            self.save()
+            self._raw_subs.pop(name, None)
+            if (removed := self.subscriptions.pop(name, None)) is not None:
+                self._index_remove(name, removed)
+                self._invalidate(name)
+            self._schedule_save(name, index=True)
             return True
 
     def get_server(self, name: str) -> ServerInfo | None:
@@ -149,18 +497,23 @@ class DataManager:
         Returns:
             服务器信息，不存在返回 None
         """
-        with self._lock:
-            return self.server_info.get(name)
+        # 单次 dict 操作在 GIL 下是原子的，无需加锁
+        return self.server_info.get(name)
 
     def has_server(self, name: str) -> bool:
         """检查服务器是否存在"""
-        with self._lock:
-            return name in self.server_info
+        return name in self.server_info
 
     def get_all_servers(self) -> dict[str, ServerInfo]:
-        """获取所有服务器"""
-        with self._lock:
-            return self.server_info.copy()
+        """获取所有服务器（副本，可在遍历期间 await 或修改）"""
+        return self.server_info.copy()
+
+    def get_all_servers_view(self) -> Mapping[str, ServerInfo]:
+        """获取所有服务器的只读视图
+
+        不复制数据，视图随服务器增删实时变化；仅适用于不跨越 await 的同步遍历。
+        """
+        return MappingProxyType(self.server_info)
 
     def update_server(self, name: str, **kwargs: Any) -> bool:
         """更新服务器信息
@@ -172,13 +525,13 @@ class DataManager:
         Returns:
             是否成功更新
         """
-        with self._lock:
-            if name not in self.server_info:
+        with self._meta_lock:
+            if (info := self.server_info.get(name)) is None:
                 return False
             for key, value in kwargs.items():
-                if hasattr(self.server_info[name], key):
-                    setattr(self.server_info[name], key, value)
-            self.save()
+                if hasattr(info, key):
+                    setattr(info, key, value)
+            self._schedule_save(index=True)
             return True
 
     # ==================== 订阅管理 ====================
@@ -193,17 +546,36 @@ class DataManager:
         Returns:
             是否成功（False 表示已订阅）
         """
-        from ..models.subscription import SubscriptionConfig as SubConfigClass
+        return bool(self.subscribe_many(server_name, (umo,)))
 
-        with self._lock:
-            if server_name not in self.subscriptions:
-                self.subscriptions[server_name] = {}
-            if umo in self.subscriptions[server_name]:
-                return False
+    def subscribe_many(self, server_name: str, umos: Iterable[str]) -> list[str]:
+        """批量添加订阅，只获取一次锁、安排一次保存
 
-            self.subscriptions[server_name][umo] = SubConfigClass()
-            self.save()
-            return True
+        Args:
+            server_name: 服务器别名
+            umos: unified_msg_origin 列表
+
+        Returns:
+            实际新增的订阅者（已订阅的会被跳过）
+        """
+        added = []
+        with self._lock_for(server_name):
+            self._ensure_loaded(server_name)
+            subs = self.subscriptions.get(server_name)
+            if subs is None:
+                subs = self.subscriptions[sys.intern(server_name)] = {}
+            for umo in umos:
+                if umo in subs:
+                    continue
+                umo = sys.intern(umo)
+                subs[umo] = SubscriptionConfig()
+                added.append(umo)
+
+            if added:
+                self._index_add(server_name, added)
+                self._invalidate(server_name)
+                self._schedule_save(server_name)
+        return added
 
     def unsubscribe(self, server_name: str, umo: str) -> bool:
         """取消订阅
@@ -215,21 +587,35 @@ class DataManager:
         Returns:
             是否成功（False 表示未订阅）
         """
-        with self._lock:
-            if server_name not in self.subscriptions:
-                return False
-            if umo not in self.subscriptions[server_name]:
-                return False
-            del self.subscriptions[server_name][umo]
-            self.save()
-            return True
+        return bool(self.unsubscribe_many(server_name, (umo,)))
+
+    def unsubscribe_many(self, server_name: str, umos: Iterable[str]) -> list[str]:
+        """批量取消订阅，只获取一次锁、安排一次保存
+
+        Args:
+            server_name: 服务器别名
+            umos: unified_msg_origin 列表
+
+        Returns:
+            实际移除的订阅者（未订阅的会被跳过）
+        """
+        with self._lock_for(server_name):
+            self._ensure_loaded(server_name)
+            subs = self.subscriptions.get(server_name)
+            if subs is None:
+                return []
+            removed = [umo for umo in umos if subs.pop(umo, _MISSING) is not _MISSING]
+
+            if removed:
+                self._index_remove(server_name, removed)
+                self._invalidate(server_name)
+                self._schedule_save(server_name)
+        return removed
 
     def get_subscribers(self, server_name: str) -> set[str]:
         """获取服务器的订阅者列表"""
-        with self._lock:
-            if server_name not in self.subscriptions:
-                return set()
-            return set(self.subscriptions[server_name].keys())
+        subs = self._peek_subscriptions(server_name)
+        return set() if subs is None else set(subs)
 
     def get_subscription_config(self, server_name: str, umo: str) -> SubscriptionConfig | None:
         """获取指定订阅的配置
@@ -241,10 +627,8 @@ class DataManager:
         Returns:
             订阅配置，不存在返回 None
         """
-        with self._lock:
-            if server_name not in self.subscriptions:
-                return None
-            return self.subscriptions[server_name].get(umo)
+        subs = self._peek_subscriptions(server_name)
+        return None if subs is None else subs.get(umo)
 
     def get_all_subscription_configs(self, server_name: str) -> dict[str, SubscriptionConfig]:
         """获取服务器所有订阅的配置
@@ -255,7 +639,8 @@ class DataManager:
         Returns:
             {umo -> SubscriptionConfig} 字典
         """
-        with self._lock:
+        with self._lock_for(server_name):
+            self._ensure_loaded(server_name)
             return self.subscriptions.get(server_name, {}).copy()
 
     def update_subscription_config(self, server_name: str, umo: str, **kwargs: Any) -> bool:
@@ -269,29 +654,84 @@ class DataManager:
         Returns:
             是否成功更新
         """
-        with self._lock:
-            if server_name not in self.subscriptions:
-                return False
-            if umo not in self.subscriptions[server_name]:
+        with self._lock_for(server_name):
+            self._ensure_loaded(server_name)
+            subs = self.subscriptions.get(server_name)
+            if subs is None or (config := subs.get(umo)) is None:
                 return False
 
-            config = self.subscriptions[server_name][umo]
-            for key, value in kwargs.items():
-                if hasattr(config, key):
-                    setattr(config, key, value)
-            self.save()
+            # 配置不可变，替换为新实例（忽略未知字段）
+            known = {f.name for f in dataclasses.fields(config)}
+            changes = {key: value for key, value in kwargs.items() if key in known}
+            subs[umo] = dataclasses.replace(config, **changes)
+            self._invalidate(server_name)
+            self._schedule_save(server_name)
             return True
 
+    def get_subscriber_sets(self, server_name: str) -> SubscriberSets:
+        """获取按通知类型划分的订阅者集合
+
+        订阅数据未变更时返回同一个对象，调用方可据此（is 比较）判断派生缓存是否失效。
+
+        Args:
+            server_name: 服务器别名
+
+        Returns:
+            订阅者集合
+        """
+        with self._lock_for(server_name):
+            sets = self._partitions.get(server_name)
+            if sets is None:
+                self._ensure_loaded(server_name)
+                configs = self.subscriptions.get(server_name, {})
+                sets = self._partitions[server_name] = SubscriberSets(
+                    join=frozenset(umo for umo, c in configs.items() if c.notify_join),
+                    leave=frozenset(umo for umo, c in configs.items() if c.notify_leave),
+                    status=frozenset(umo for umo, c in configs.items() if c.notify_status),
+                    at_all=frozenset(umo for umo, c in configs.items() if c.at_all),
+                )
+            return sets
+
+    def _invalidate(self, server_name: str) -> None:
+        """标记服务器订阅数据已变更（调用方需持有该服务器的分段锁）"""
+        self._partitions.pop(server_name, None)
+
+    def _index_add(self, server_name: str, umos: Iterable[str]) -> None:
+        """将订阅加入反向索引并更新订阅总数"""
+        with self._user_index_lock:
+            for umo in umos:
+                servers = self._user_index.setdefault(umo, set())
+                if server_name not in servers:
+                    servers.add(server_name)
+                    self._total_subs += 1
+
+    def _index_remove(self, server_name: str, umos: Iterable[str]) -> None:
+        """从反向索引中移除订阅并更新订阅总数"""
+        with self._user_index_lock:
+            for umo in umos:
+                servers = self._user_index.get(umo)
+                if servers is None or server_name not in servers:
+                    continue
+                servers.remove(server_name)
+                self._total_subs -= 1
+                if not servers:
+                    del self._user_index[umo]
+
     def get_user_subscriptions(self, umo: str) -> list[str]:
-        """获取用户订阅的服务器列表"""
-        with self._lock:
-            return [
-                server_name
-                for server_name, sub_dict in self.subscriptions.items()
-                if umo in sub_dict
-            ]
+        """获取用户订阅的服务器列表（按别名排序）
+
+        反向索引只覆盖已加载的服务器，因此会先加载全部服务器的订阅文件：
+        首次调用的开销与总订阅数成正比，此后不再有文件读取。
+        """
+        self._ensure_all_loaded()
+        with self._user_index_lock:
+            return sorted(self._user_index.get(umo, ()))
 
     def get_total_subscriptions(self) -> int:
-        """获取总订阅数"""
-        with self._lock:
-            return sum(len(s) for s in self.subscriptions.values())
+        """获取总订阅数
+
+        计数只覆盖已加载的服务器，因此会先加载全部服务器的订阅文件：
+        首次调用的开销与总订阅数成正比，此后为 O(1)。
+        """
+        self._ensure_all_loaded()
+        return self._total_subs
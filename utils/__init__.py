@@ -1,5 +1,6 @@
 """Utils module exports"""
 
 from .constants import format_duration
+from .net import tune_query_socket
 
-__all__ = ["format_duration"]
+__all__ = ["format_duration", "tune_query_socket"]
@@ -1,11 +1,13 @@
 """常量和工具函数"""
 
+import functools
+
 
 # 默认配置
 DEFAULT_QUERY_PORT = 10011
 DEFAULT_VIRTUAL_SERVER_ID = 1
 DEFAULT_STATUS_INTERVAL = 60  # 分钟
-DEFAULT_POLL_INTERVAL = 10  # 秒
+DEFAULT_KEEPALIVE_INTERVAL = 240  # 秒，需小于 ServerQuery 默认空闲超时（300 秒）
 
 
 def format_duration(seconds: int) -> str:
@@ -17,19 +19,21 @@ def format_duration(seconds: int) -> str:
     Returns:
         格式化的时长字符串，如 "1天2小时30分钟"
     """
-    if seconds <= 0:
-        return "0分钟"
-
-    days = seconds // 86400
-    hours = (seconds % 86400) // 3600
-    minutes = (seconds % 3600) // 60
-
-    parts = []
-    if days > 0:
-        parts.append(f"{days}天")
-    if hours > 0:
-        parts.append(f"{hours}小时")
-    if minutes > 0 or not parts:
-        parts.append(f"{minutes}分钟")
-
-    return "".join(parts)
+    # 结果只精确到分钟，按分钟缓存可提高命中率
+    return _format_minutes(max(seconds, 0) // 60)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_minutes(minutes: int) -> str:
+    """按分钟数格式化时长（结果缓存）"""
+    if minutes < 60:
+        return f"{minutes}分钟"
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+
+    # 固定的分支判断，省去列表拼接
+    if days:
+        if hours:
+            return f"{days}天{hours}小时{minutes}分钟" if minutes else f"{days}天{hours}小时"
+        return f"{days}天{minutes}分钟" if minutes else f"{days}天"
+    return f"{hours}小时{minutes}分钟" if minutes else f"{hours}小时"
@@ -0,0 +1,33 @@
+"""网络相关工具"""
+
+import socket
+
+# 接收缓冲区大小，大型服务器的 clientlist/channellist 响应可达数百 KiB
+RECV_BUFFER_SIZE = 256 * 1024
+
+# TCP keepalive 参数：空闲 60 秒后开始探测，每 15 秒一次，连续 4 次失败判定断开
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_COUNT = 4
+
+
+def tune_query_socket(sock: socket.socket) -> None:
+    """为 ServerQuery 连接调整套接字选项
+
+    ServerQuery 是一问一答的文本协议，命令都是小包，
+    关闭 Nagle 算法可避免每条命令最多约 40ms 的发送延迟；
+    开启 keepalive 以便及早发现对端已失联的连接。
+
+    Args:
+        sock: 已连接的 TCP 套接字
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # 以下选项仅 Linux 等平台提供
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+    if hasattr(socket, "TCP_KEEPCNT"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)